@@ -1,6 +1,8 @@
 from adapters.line import LineAdapter
 from adapters.whatsapp import WhatsAppAdapter
 from adapters.telegram import TelegramAdapter
+from core.prometheus import SEND_REPLY_DURATION, observe
+from core.tracing import span
 from schemas.message import IncomingMessage
 
 ADAPTERS = {
@@ -14,4 +16,7 @@ def send_reply(message: IncomingMessage, reply_text: str) -> None:
     if not adapter:
         raise RuntimeError(f"No adapter found for platform: {message.platform}")
 
-    adapter.send_reply(message, reply_text)
+    with observe(SEND_REPLY_DURATION, message.platform), span(
+        "send_reply", "client", platform=message.platform
+    ):
+        adapter.send_reply(message, reply_text)
@@ -0,0 +1,73 @@
+"""add hot-path partial and composite indexes concurrently
+
+Revision ID: 0f1a2b3c4d5e
+Revises: 9e0f1a2b3c4d
+Create Date: 2026-10-19 14:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0f1a2b3c4d5e"
+down_revision: Union[str, None] = "9e0f1a2b3c4d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction, so the
+# statements run in an autocommit block. If a build fails it leaves an
+# INVALID index behind; drop it before re-running the upgrade.
+_ACTIVITY = sa.text("coalesce(updated_at, created_at) DESC")
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Unread counting: role = 'user' AND created_at > last_read_at per session.
+        op.create_index(
+            "ix_messages_session_user_created",
+            "messages",
+            ["session_id", "created_at"],
+            postgresql_where=sa.text("role = 'user'"),
+            postgresql_concurrently=True,
+        )
+        # Conversation list filtered by channel, in list order.
+        op.create_index(
+            "ix_channel_sessions_platform_activity",
+            "channel_sessions",
+            ["platform", _ACTIVITY, sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+        # Conversation list with unread_only=true.
+        op.create_index(
+            "ix_channel_sessions_unread_activity",
+            "channel_sessions",
+            [_ACTIVITY, sa.text("id DESC")],
+            postgresql_where=sa.text("unread_count > 0"),
+            postgresql_concurrently=True,
+        )
+        # Broadcast targets: active sessions, optionally one platform.
+        op.create_index(
+            "ix_channel_sessions_active_platform",
+            "channel_sessions",
+            ["platform"],
+            postgresql_where=sa.text("status = 'active'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table in (
+            ("ix_channel_sessions_active_platform", "channel_sessions"),
+            ("ix_channel_sessions_unread_activity", "channel_sessions"),
+            ("ix_channel_sessions_platform_activity", "channel_sessions"),
+            ("ix_messages_session_user_created", "messages"),
+        ):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,64 @@
+"""add metrics_hourly rollup table
+
+Revision ID: 1a2b3c4d5e6f
+Revises: 0f1a2b3c4d5e
+Create Date: 2026-10-19 14:30:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "1a2b3c4d5e6f"
+down_revision: Union[str, None] = "0f1a2b3c4d5e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BRIN_INDEXES = (
+    ("ix_messages_created_at_brin", "messages"),
+    ("ix_channel_sessions_created_at_brin", "channel_sessions"),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "metrics_hourly",
+        sa.Column("metric", sa.String(), nullable=False),
+        sa.Column("bucket", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("platform", sa.String(), server_default="", nullable=False),
+        sa.Column("role", sa.String(), server_default="", nullable=False),
+        sa.Column("organization_id", sa.String(), server_default="", nullable=False),
+        sa.Column("value", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("metric", "bucket", "platform", "role", "organization_id"),
+    )
+    # The rollup job scans recent rows by creation time; both tables are
+    # append-mostly, so BRIN indexes stay tiny. Built concurrently so the hot
+    # tables keep taking writes; a failed build leaves an INVALID index to
+    # drop before re-running.
+    with op.get_context().autocommit_block():
+        for name, table in _BRIN_INDEXES:
+            op.create_index(
+                name,
+                table,
+                ["created_at"],
+                postgresql_using="brin",
+                postgresql_concurrently=True,
+            )
+    # History is not backfilled here: with no watermark stored, the first
+    # metrics_rollup run rolls it up a day per transaction.
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table in reversed(_BRIN_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+    op.drop_table("metrics_hourly")
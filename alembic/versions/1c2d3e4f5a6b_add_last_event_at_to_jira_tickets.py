@@ -0,0 +1,29 @@
+"""add last_event_at to jira_tickets
+
+Revision ID: 1c2d3e4f5a6b
+Revises: 70f9f17b3200
+Create Date: 2026-10-19 09:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "1c2d3e4f5a6b"
+down_revision: Union[str, None] = "70f9f17b3200"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "jira_tickets",
+        sa.Column("last_event_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("jira_tickets", "last_event_at")
@@ -0,0 +1,51 @@
+"""add denormalized counters to organizations
+
+Revision ID: 2b3c4d5e6f7a
+Revises: 1a2b3c4d5e6f
+Create Date: 2026-10-19 15:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2b3c4d5e6f7a"
+down_revision: Union[str, None] = "1a2b3c4d5e6f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for column in ("user_count", "conversation_count", "ticket_count"):
+        op.add_column(
+            "organizations",
+            sa.Column(column, sa.Integer(), server_default="0", nullable=False),
+        )
+    op.create_index("ix_users_organization_email", "users", ["organization_id", "email"])
+    op.create_index("ix_channel_sessions_user_id", "channel_sessions", ["user_id"])
+    op.create_index("ix_organizations_name", "organizations", ["name", "id"])
+
+    op.execute(
+        """
+        UPDATE organizations AS o
+        SET user_count = (SELECT count(*) FROM users AS u WHERE u.organization_id = o.id),
+            conversation_count = (
+                SELECT count(*)
+                FROM channel_sessions AS cs
+                JOIN users AS u ON u.id = cs.user_id
+                WHERE u.organization_id = o.id
+            ),
+            ticket_count = (SELECT count(*) FROM ticket_links AS t WHERE t.organization_id = o.id)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_organizations_name", table_name="organizations")
+    op.drop_index("ix_channel_sessions_user_id", table_name="channel_sessions")
+    op.drop_index("ix_users_organization_email", table_name="users")
+    for column in ("ticket_count", "conversation_count", "user_count"):
+        op.drop_column("organizations", column)
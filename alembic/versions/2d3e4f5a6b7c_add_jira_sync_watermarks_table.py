@@ -0,0 +1,36 @@
+"""add jira_sync_watermarks table
+
+Revision ID: 2d3e4f5a6b7c
+Revises: 1c2d3e4f5a6b
+Create Date: 2026-10-19 09:30:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2d3e4f5a6b7c"
+down_revision: Union[str, None] = "1c2d3e4f5a6b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jira_sync_watermarks",
+        sa.Column("project_key", sa.String(), primary_key=True),
+        sa.Column("last_updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("jira_sync_watermarks")
@@ -0,0 +1,151 @@
+"""partition messages by month on created_at
+
+Revision ID: 3c4d5e6f7a8b
+Revises: 2b3c4d5e6f7a
+Create Date: 2026-10-19 17:00:00.000000
+"""
+
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c4d5e6f7a8b"
+down_revision: Union[str, None] = "2b3c4d5e6f7a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = "id, session_id, external_message_id, role, content, created_at, search_vector"
+# Months created ahead of the current one; the message_partitions job keeps
+# this window rolling afterwards.
+_PREMAKE_MONTHS = 3
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_table(name: str, partitioned: bool) -> None:
+    op.execute(
+        f"""
+        CREATE TABLE {name} (
+            id UUID NOT NULL,
+            session_id UUID NOT NULL,
+            external_message_id VARCHAR,
+            role VARCHAR NOT NULL,
+            content TEXT NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT clock_timestamp() NOT NULL,
+            search_vector TSVECTOR
+        ){" PARTITION BY RANGE (created_at)" if partitioned else ""}
+        """
+    )
+
+
+def _create_indexes() -> None:
+    # search_vector is maintained by the trigger from 7c8d9e0f1a2b, which is
+    # dropped with the old table; row triggers on a partitioned table need
+    # PostgreSQL 13 or later.
+    op.execute(
+        "CREATE TRIGGER messages_search_vector BEFORE INSERT OR UPDATE OF content "
+        "ON messages FOR EACH ROW EXECUTE FUNCTION messages_search_vector_update()"
+    )
+    op.create_foreign_key(
+        "messages_session_id_fkey",
+        "messages",
+        "channel_sessions",
+        ["session_id"],
+        ["id"],
+    )
+    op.create_index("ix_messages_session_id", "messages", ["session_id"])
+    op.create_index(
+        "ix_messages_session_created_id",
+        "messages",
+        ["session_id", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+    op.create_index(
+        "ix_messages_session_user_created",
+        "messages",
+        ["session_id", "created_at"],
+        postgresql_where=sa.text("role = 'user'"),
+    )
+    op.create_index(
+        "ix_messages_search_vector",
+        "messages",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+    # From 1a2b3c4d5e6f: the metrics rollup scans recent rows of the current
+    # partition by created_at.
+    op.create_index(
+        "ix_messages_created_at_brin",
+        "messages",
+        ["created_at"],
+        postgresql_using="brin",
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Block writes (reads still run) from the copy until the swap commits, so
+    # webhook inserts cannot land in the old table after it has been read.
+    op.execute("LOCK TABLE messages IN EXCLUSIVE MODE")
+    oldest = bind.execute(
+        sa.text("SELECT date_trunc('month', min(created_at) AT TIME ZONE 'UTC') FROM messages")
+    ).scalar()
+    now = datetime.now(timezone.utc)
+    current = date(now.year, now.month, 1)
+    month = date(oldest.year, oldest.month, 1) if oldest else current
+
+    _create_table("messages_partitioned", partitioned=True)
+    while month <= _add_months(current, _PREMAKE_MONTHS):
+        name = f"messages_p{month:%Y_%m}"
+        op.execute(
+            f"CREATE TABLE {name} PARTITION OF messages_partitioned "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d} 00:00:00+00') "
+            f"TO ('{_add_months(month, 1):%Y-%m-%d} 00:00:00+00')"
+        )
+        month = _add_months(month, 1)
+
+    op.execute(f"INSERT INTO messages_partitioned ({_COLUMNS}) SELECT {_COLUMNS} FROM messages")
+    op.drop_table("messages")
+    op.rename_table("messages_partitioned", "messages")
+
+    # The primary key of a partitioned table must contain the partition key.
+    op.create_primary_key("messages_pkey", "messages", ["id", "created_at"])
+    _create_indexes()
+    # Likewise for unique constraints, so the webhook dedupe key is enforced
+    # per partition (see MessagePartitionService).
+    partitions = bind.execute(
+        sa.text(
+            "SELECT c.relname FROM pg_inherits AS i "
+            "JOIN pg_class AS c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'messages'::regclass"
+        )
+    ).scalars().all()
+    for name in partitions:
+        op.execute(
+            f"CREATE UNIQUE INDEX {name}_session_external_key "
+            f"ON {name} (session_id, external_message_id)"
+        )
+    op.execute("ANALYZE messages")
+
+
+def downgrade() -> None:
+    # Partitions already archived and dropped are not restored.
+    op.execute("LOCK TABLE messages IN EXCLUSIVE MODE")
+    _create_table("messages_unpartitioned", partitioned=False)
+    op.execute(f"INSERT INTO messages_unpartitioned ({_COLUMNS}) SELECT {_COLUMNS} FROM messages")
+    op.drop_table("messages")
+    op.rename_table("messages_unpartitioned", "messages")
+
+    op.create_primary_key("messages_pkey", "messages", ["id"])
+    op.create_unique_constraint(
+        "uq_session_external_message_id",
+        "messages",
+        ["session_id", "external_message_id"],
+    )
+    _create_indexes()
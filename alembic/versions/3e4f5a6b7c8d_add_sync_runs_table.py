@@ -0,0 +1,47 @@
+"""add sync_runs table
+
+Revision ID: 3e4f5a6b7c8d
+Revises: 2d3e4f5a6b7c
+Create Date: 2026-10-19 10:30:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.dialects import postgresql
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3e4f5a6b7c8d"
+down_revision: Union[str, None] = "2d3e4f5a6b7c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sync_runs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("stage", sa.String(), nullable=True),
+        sa.Column(
+            "started_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("stages", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("summary", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+    op.create_index("ix_sync_runs_kind", "sync_runs", ["kind"])
+    op.create_index("ix_sync_runs_started_at", "sync_runs", ["started_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sync_runs_started_at", table_name="sync_runs")
+    op.drop_index("ix_sync_runs_kind", table_name="sync_runs")
+    op.drop_table("sync_runs")
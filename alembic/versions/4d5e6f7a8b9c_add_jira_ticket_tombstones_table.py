@@ -0,0 +1,30 @@
+"""add jira_ticket_tombstones table
+
+Revision ID: 4d5e6f7a8b9c
+Revises: 3c4d5e6f7a8b
+Create Date: 2026-10-20 09:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4d5e6f7a8b9c"
+down_revision: Union[str, None] = "3c4d5e6f7a8b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jira_ticket_tombstones",
+        sa.Column("ticket_key", sa.String(), primary_key=True),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("jira_ticket_tombstones")
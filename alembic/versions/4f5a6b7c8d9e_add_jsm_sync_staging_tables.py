@@ -0,0 +1,54 @@
+"""add jsm sync staging tables
+
+Revision ID: 4f5a6b7c8d9e
+Revises: 3e4f5a6b7c8d
+Create Date: 2026-10-19 11:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.dialects import postgresql
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4f5a6b7c8d9e"
+down_revision: Union[str, None] = "3e4f5a6b7c8d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jsm_org_stage",
+        sa.Column("run_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("batch", sa.Integer(), nullable=False),
+        sa.Column("jsm_id", sa.String(), nullable=False),
+        sa.Column("jsm_uuid", sa.String(), nullable=True),
+        sa.Column("name", sa.String(), nullable=True),
+        prefixes=["UNLOGGED"],
+    )
+    op.create_index("ix_jsm_org_stage_run_batch", "jsm_org_stage", ["run_id", "batch"])
+    op.create_index("ix_jsm_org_stage_run_jsm_id", "jsm_org_stage", ["run_id", "jsm_id"])
+
+    op.create_table(
+        "jsm_user_stage",
+        sa.Column("run_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("batch", sa.Integer(), nullable=False),
+        sa.Column("jsm_account_id", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("org_jsm_id", sa.String(), nullable=False),
+        prefixes=["UNLOGGED"],
+    )
+    op.create_index("ix_jsm_user_stage_run_batch", "jsm_user_stage", ["run_id", "batch"])
+    op.create_index("ix_jsm_user_stage_run_account", "jsm_user_stage", ["run_id", "jsm_account_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jsm_user_stage_run_account", table_name="jsm_user_stage")
+    op.drop_index("ix_jsm_user_stage_run_batch", table_name="jsm_user_stage")
+    op.drop_table("jsm_user_stage")
+    op.drop_index("ix_jsm_org_stage_run_jsm_id", table_name="jsm_org_stage")
+    op.drop_index("ix_jsm_org_stage_run_batch", table_name="jsm_org_stage")
+    op.drop_table("jsm_org_stage")
@@ -0,0 +1,75 @@
+"""add last message and unread counters to channel_sessions
+
+Revision ID: 5a6b7c8d9e0f
+Revises: 4f5a6b7c8d9e
+Create Date: 2026-10-19 11:30:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5a6b7c8d9e0f"
+down_revision: Union[str, None] = "4f5a6b7c8d9e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("channel_sessions", sa.Column("last_message_text", sa.Text(), nullable=True))
+    op.add_column("channel_sessions", sa.Column("last_message_role", sa.String(), nullable=True))
+    op.add_column(
+        "channel_sessions",
+        sa.Column("last_message_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "channel_sessions",
+        sa.Column("unread_count", sa.Integer(), server_default="0", nullable=False),
+    )
+
+    op.execute(
+        """
+        UPDATE channel_sessions AS cs
+        SET last_message_text = m.content,
+            last_message_role = m.role,
+            last_message_at = m.created_at
+        FROM (
+            SELECT DISTINCT ON (session_id) session_id, content, role, created_at
+            FROM messages
+            ORDER BY session_id, created_at DESC, id DESC
+        ) AS m
+        WHERE cs.id = m.session_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE channel_sessions AS cs
+        SET unread_count = u.unread_count
+        FROM (
+            SELECT m.session_id, count(*) AS unread_count
+            FROM messages AS m
+            JOIN channel_sessions AS s ON s.id = m.session_id
+            WHERE m.role = 'user'
+                AND m.created_at > coalesce(s.last_read_at, '1970-01-01'::timestamptz)
+            GROUP BY m.session_id
+        ) AS u
+        WHERE cs.id = u.session_id
+        """
+    )
+
+    op.create_index(
+        "ix_channel_sessions_updated_created",
+        "channel_sessions",
+        [sa.text("updated_at DESC"), sa.text("created_at DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_channel_sessions_updated_created", table_name="channel_sessions")
+    op.drop_column("channel_sessions", "unread_count")
+    op.drop_column("channel_sessions", "last_message_at")
+    op.drop_column("channel_sessions", "last_message_role")
+    op.drop_column("channel_sessions", "last_message_text")
@@ -0,0 +1,30 @@
+"""add scheduler_job_runs table
+
+Revision ID: 5e6f7a8b9c0d
+Revises: 4d5e6f7a8b9c
+Create Date: 2026-10-20 09:30:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5e6f7a8b9c0d"
+down_revision: Union[str, None] = "4d5e6f7a8b9c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scheduler_job_runs",
+        sa.Column("job_name", sa.String(), primary_key=True),
+        sa.Column("last_started_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("scheduler_job_runs")
@@ -0,0 +1,58 @@
+"""add keyset pagination indexes
+
+Revision ID: 6b7c8d9e0f1a
+Revises: 5a6b7c8d9e0f
+Create Date: 2026-10-19 12:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6b7c8d9e0f1a"
+down_revision: Union[str, None] = "5a6b7c8d9e0f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_channel_sessions_updated_created", table_name="channel_sessions")
+    op.create_index(
+        "ix_channel_sessions_activity_id",
+        "channel_sessions",
+        [sa.text("coalesce(updated_at, created_at) DESC"), sa.text("id DESC")],
+    )
+    op.create_index(
+        "ix_jira_tickets_created_id",
+        "jira_tickets",
+        [sa.text("created_at DESC NULLS LAST"), sa.text("id DESC")],
+    )
+    # messages is the largest table, so its index is built without blocking
+    # writes. CONCURRENTLY cannot run inside a transaction; a failed build
+    # leaves an INVALID index that must be dropped before re-running.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_messages_session_created_id",
+            "messages",
+            ["session_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_messages_session_created_id",
+            table_name="messages",
+            postgresql_concurrently=True,
+        )
+    op.drop_index("ix_jira_tickets_created_id", table_name="jira_tickets")
+    op.drop_index("ix_channel_sessions_activity_id", table_name="channel_sessions")
+    op.create_index(
+        "ix_channel_sessions_updated_created",
+        "channel_sessions",
+        [sa.text("updated_at DESC"), sa.text("created_at DESC")],
+    )
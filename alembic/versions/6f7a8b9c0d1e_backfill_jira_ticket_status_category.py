@@ -0,0 +1,57 @@
+"""backfill jira_tickets.status_category and make it NOT NULL
+
+Revision ID: 6f7a8b9c0d1e
+Revises: 5e6f7a8b9c0d
+Create Date: 2026-10-20 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6f7a8b9c0d1e"
+down_revision: Union[str, None] = "5e6f7a8b9c0d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mirrors STATUS_CATEGORY_BY_NAME in core/jira_constants.py; the next full
+# ticket sync writes Jira's own statusCategory for every row.
+_BACKFILL = """
+UPDATE jira_tickets
+SET status_category = CASE
+    WHEN lower(trim(status)) IN (
+        'done', 'closed', 'resolved', 'completed',
+        'cancelled', 'canceled', 'declined', 'rejected'
+    ) OR lower(status) LIKE '%done%' THEN 'done'
+    WHEN lower(trim(status)) IN (
+        'open', 'to do', 'new', 'backlog', 'reopened', 'waiting for support'
+    ) THEN 'new'
+    ELSE 'indeterminate'
+END
+WHERE status_category IS NULL
+    OR status_category NOT IN ('new', 'indeterminate', 'done')
+"""
+
+
+def upgrade() -> None:
+    op.execute(_BACKFILL)
+    op.alter_column(
+        "jira_tickets",
+        "status_category",
+        existing_type=sa.String(),
+        nullable=False,
+        server_default="indeterminate",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "jira_tickets",
+        "status_category",
+        existing_type=sa.String(),
+        nullable=True,
+        server_default=None,
+    )
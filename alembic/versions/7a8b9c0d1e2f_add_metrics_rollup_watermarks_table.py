@@ -0,0 +1,36 @@
+"""add metrics_rollup_watermarks table
+
+Revision ID: 7a8b9c0d1e2f
+Revises: 6f7a8b9c0d1e
+Create Date: 2026-10-21 09:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7a8b9c0d1e2f"
+down_revision: Union[str, None] = "6f7a8b9c0d1e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "metrics_rollup_watermarks",
+        sa.Column("name", sa.String(), primary_key=True),
+        sa.Column("rolled_up_until", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("metrics_rollup_watermarks")
@@ -0,0 +1,133 @@
+"""add full-text search vectors and trigram indexes
+
+Revision ID: 7c8d9e0f1a2b
+Revises: 6b7c8d9e0f1a
+Create Date: 2026-10-19 12:30:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.dialects import postgresql
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7c8d9e0f1a2b"
+down_revision: Union[str, None] = "6b7c8d9e0f1a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# search_vector is a plain nullable column kept current by a BEFORE trigger.
+# A STORED generated column would rewrite both tables under ACCESS EXCLUSIVE;
+# this way existing rows are backfilled in small committed batches and every
+# index is built concurrently. CONCURRENTLY cannot run inside a transaction,
+# so a failed build leaves an INVALID index to drop before re-running.
+_MESSAGE_VECTOR = (
+    "to_tsvector('english', coalesce({row}content, '')) || "
+    "to_tsvector('simple', coalesce({row}content, ''))"
+)
+_TICKET_VECTOR = (
+    "setweight(to_tsvector('english', coalesce({row}summary, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({row}summary, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce({row}description, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce({row}description, '')), 'B')"
+)
+# (table, vector expression, columns that feed it)
+_SEARCH_TABLES = (
+    ("messages", _MESSAGE_VECTOR, "content"),
+    ("jira_tickets", _TICKET_VECTOR, "summary, description"),
+)
+_TRIGRAM_INDEXES = (
+    ("ix_users_email_trgm", "users", "email"),
+    ("ix_channel_sessions_external_user_id_trgm", "channel_sessions", "external_user_id"),
+    ("ix_channel_sessions_last_message_text_trgm", "channel_sessions", "last_message_text"),
+    ("ix_jira_tickets_ticket_key_trgm", "jira_tickets", "ticket_key"),
+)
+_BACKFILL_BATCH = 5000
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for table, vector, columns in _SEARCH_TABLES:
+        op.add_column(table, sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+        op.execute(
+            f"""
+            CREATE OR REPLACE FUNCTION {table}_search_vector_update() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                NEW.search_vector := {vector.format(row="NEW.")};
+                RETURN NEW;
+            END
+            $$
+            """
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_search_vector BEFORE INSERT OR UPDATE OF {columns} "
+            f"ON {table} FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()"
+        )
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        for table, vector, _ in _SEARCH_TABLES:
+            # The trigger covers rows written from here on. Batches walk the
+            # primary key and each commits on its own, so no lock is held
+            # across the table.
+            last_id = None
+            while True:
+                ids = bind.execute(
+                    sa.text(
+                        f"""
+                        WITH batch AS (
+                            SELECT id FROM {table}
+                            WHERE :last_id IS NULL OR id > CAST(:last_id AS uuid)
+                            ORDER BY id
+                            LIMIT {_BACKFILL_BATCH}
+                        )
+                        UPDATE {table} AS t
+                        SET search_vector = {vector.format(row="t.")}
+                        FROM batch
+                        WHERE t.id = batch.id
+                        RETURNING t.id
+                        """
+                    ),
+                    {"last_id": last_id},
+                ).scalars().all()
+                if not ids:
+                    break
+                last_id = str(max(ids))
+
+        for table, _, _ in _SEARCH_TABLES:
+            op.create_index(
+                f"ix_{table}_search_vector",
+                table,
+                ["search_vector"],
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+            )
+        for name, table, column in _TRIGRAM_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(_TRIGRAM_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+        for table, _, _ in reversed(_SEARCH_TABLES):
+            op.drop_index(
+                f"ix_{table}_search_vector",
+                table_name=table,
+                postgresql_concurrently=True,
+            )
+    for table, _, _ in reversed(_SEARCH_TABLES):
+        op.execute(f"DROP TRIGGER {table}_search_vector ON {table}")
+        op.execute(f"DROP FUNCTION {table}_search_vector_update()")
+        op.drop_column(table, "search_vector")
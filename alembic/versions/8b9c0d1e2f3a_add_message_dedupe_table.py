@@ -0,0 +1,51 @@
+"""add message_dedupe table
+
+Revision ID: 8b9c0d1e2f3a
+Revises: 7a8b9c0d1e2f
+Create Date: 2026-10-22 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.dialects import postgresql
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8b9c0d1e2f3a"
+down_revision: Union[str, None] = "7a8b9c0d1e2f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # messages only has a per-partition unique index on this key since
+    # 3c4d5e6f7a8b; this table enforces it across months.
+    op.create_table(
+        "message_dedupe",
+        sa.Column("session_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("external_message_id", sa.String(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["session_id"], ["channel_sessions.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("session_id", "external_message_id"),
+    )
+    op.execute(
+        """
+        INSERT INTO message_dedupe (session_id, external_message_id, created_at)
+        SELECT session_id, external_message_id, min(created_at)
+        FROM messages
+        WHERE external_message_id IS NOT NULL
+        GROUP BY session_id, external_message_id
+        ON CONFLICT DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("message_dedupe")
@@ -0,0 +1,36 @@
+"""add status_category to jira_tickets
+
+Revision ID: 8d9e0f1a2b3c
+Revises: 7c8d9e0f1a2b
+Create Date: 2026-10-19 13:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d9e0f1a2b3c"
+down_revision: Union[str, None] = "7c8d9e0f1a2b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("jira_tickets", sa.Column("status_category", sa.String(), nullable=True))
+    # Same rule the list endpoint used before; the next sync writes the real key.
+    op.execute(
+        "UPDATE jira_tickets SET status_category = 'done' WHERE lower(status) LIKE '%done%'"
+    )
+    op.create_index(
+        "ix_jira_tickets_status_category_created",
+        "jira_tickets",
+        ["status_category", sa.text("created_at DESC NULLS LAST"), sa.text("id DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jira_tickets_status_category_created", table_name="jira_tickets")
+    op.drop_column("jira_tickets", "status_category")
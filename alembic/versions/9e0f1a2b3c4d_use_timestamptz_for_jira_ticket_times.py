@@ -0,0 +1,50 @@
+"""use timestamptz for jira_tickets created_at/updated_at
+
+Revision ID: 9e0f1a2b3c4d
+Revises: 8d9e0f1a2b3c
+Create Date: 2026-10-19 13:30:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9e0f1a2b3c4d"
+down_revision: Union[str, None] = "8d9e0f1a2b3c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Jira ISO strings (2024-01-15T10:30:00.000+0700) cast directly; indexes
+    # on these columns are rebuilt by ALTER TYPE.
+    for column in ("created_at", "updated_at"):
+        op.alter_column(
+            "jira_tickets",
+            column,
+            type_=sa.DateTime(timezone=True),
+            existing_type=sa.String(),
+            existing_nullable=True,
+            postgresql_using=f"nullif({column}, '')::timestamptz",
+        )
+    op.create_index(
+        "ix_jira_tickets_project_updated",
+        "jira_tickets",
+        ["project_key", "updated_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jira_tickets_project_updated", table_name="jira_tickets")
+    for column in ("created_at", "updated_at"):
+        op.alter_column(
+            "jira_tickets",
+            column,
+            type_=sa.String(),
+            existing_type=sa.DateTime(timezone=True),
+            existing_nullable=True,
+            postgresql_using=f"to_char({column} AT TIME ZONE 'UTC', 'YYYY-MM-DD\"T\"HH24:MI:SS.MS\"+0000\"')",
+        )
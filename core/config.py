@@ -7,11 +7,22 @@ class Settings(BaseSettings):
     environment: str = Field("development", alias="ENVIRONMENT")
     port: int = Field(8000, alias="PORT")
     log_level: str = Field("INFO", alias="LOG_LEVEL")
+    log_sample_rate: float = Field(1.0, alias="LOG_SAMPLE_RATE")
+    log_rate_limit_per_minute: int = Field(0, alias="LOG_RATE_LIMIT_PER_MINUTE")
+    slow_query_ms: int = Field(200, alias="SLOW_QUERY_MS")
+    n_plus_one_threshold: int = Field(10, alias="N_PLUS_ONE_THRESHOLD")
+    trace_sample_rate: float = Field(0.0, alias="TRACE_SAMPLE_RATE")
+    trace_exporter: str = Field("none", alias="TRACE_EXPORTER")
+    trace_otlp_endpoint: Optional[str] = Field(None, alias="TRACE_OTLP_ENDPOINT")
+    trace_service_name: str = Field("jsm-omnichannel-be", alias="TRACE_SERVICE_NAME")
     gcp_project_id: Optional[str] = Field(None, alias="GCP_PROJECT_ID")
 
     base_url: Optional[str] = Field(None, alias="BASE_URL")
     
     database_url: str = Field(..., alias="DATABASE_URL")
+    database_replica_url: Optional[str] = Field(None, alias="DATABASE_REPLICA_URL")
+    replica_max_lag_seconds: float = Field(10.0, alias="REPLICA_MAX_LAG_SECONDS")
+    replica_lag_check_seconds: float = Field(5.0, alias="REPLICA_LAG_CHECK_SECONDS")
     
     jira_base: Optional[str] = Field(None, alias="JIRA_BASE")
     jira_email: Optional[str] = Field(None, alias="JIRA_EMAIL")
@@ -45,6 +56,21 @@ class Settings(BaseSettings):
     rate_limit_max: int = Field(30, alias="RATE_LIMIT_MAX")
     auth_ttl_days: int = Field(10, alias="AUTH_TTL_DAYS")
 
+    scheduler_enabled: bool = Field(True, alias="SCHEDULER_ENABLED")
+    scheduler_start_delay_seconds: int = Field(5, alias="SCHEDULER_START_DELAY_SECONDS")
+    scheduler_jitter_seconds: int = Field(60, alias="SCHEDULER_JITTER_SECONDS")
+    jira_sync_interval_seconds: int = Field(86400, alias="JIRA_SYNC_INTERVAL_SECONDS")
+    jira_ticket_sync_interval_seconds: int = Field(3600, alias="JIRA_TICKET_SYNC_INTERVAL_SECONDS")
+    metrics_rollup_interval_seconds: int = Field(300, alias="METRICS_ROLLUP_INTERVAL_SECONDS")
+    message_partition_interval_seconds: int = Field(86400, alias="MESSAGE_PARTITION_INTERVAL_SECONDS")
+    message_partition_premake_months: int = Field(3, alias="MESSAGE_PARTITION_PREMAKE_MONTHS")
+    message_retention_months: int = Field(0, alias="MESSAGE_RETENTION_MONTHS")
+    message_archive_dir: Optional[str] = Field(None, alias="MESSAGE_ARCHIVE_DIR")
+
+    stream_queue_size: int = Field(100, alias="STREAM_QUEUE_SIZE")
+    stream_keepalive_seconds: int = Field(15, alias="STREAM_KEEPALIVE_SECONDS")
+    read_mark_flush_interval_ms: int = Field(250, alias="READ_MARK_FLUSH_INTERVAL_MS")
+
     model_config = SettingsConfigDict(
         env_file=(".env", ".env.local"),
         case_sensitive=True,
@@ -1,14 +1,61 @@
-from sqlalchemy import create_engine
+import logging
+import threading
+import time
+
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 from core.config import settings
+from core.prometheus import DB_CONNECTIONS_IN_USE, DB_POOL_WAIT, child
+from core import query_stats, tracing
+
+logger = logging.getLogger(__name__)
+
+
+def _timed_pool(name: str) -> type:
+    """QueuePool that records how long each checkout waits, under `name`."""
+    wait = child(DB_POOL_WAIT, name)
+
+    class TimedQueuePool(QueuePool):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                wait.observe(time.perf_counter() - start)
+
+    return TimedQueuePool
 
-engine = create_engine(settings.database_url)
+
+def _create_engine(url: str, name: str, **kwargs):
+    created = create_engine(url, poolclass=_timed_pool(name), **kwargs)
+    in_use = child(DB_CONNECTIONS_IN_USE, name)
+    event.listen(created, "checkout", lambda *_: in_use.inc())
+    event.listen(created, "checkin", lambda *_: in_use.dec())
+    query_stats.install(created)
+    tracing.install_db_spans(created)
+    return created
+
+
+engine = _create_engine(settings.database_url, "primary")
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine,
 )
 
+# Optional streaming replica for dashboard reads. Without it, reads use the primary.
+replica_engine = (
+    _create_engine(settings.database_replica_url, "replica", pool_pre_ping=True)
+    if settings.database_replica_url
+    else None
+)
+ReplicaSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    if replica_engine is not None
+    else None
+)
+
 Base = declarative_base()
 
 def get_db():
@@ -17,3 +64,68 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def get_read_db():
+    """
+    Session for read-only dashboard queries. Routed to the replica when one
+    is configured and its replay lag is within REPLICA_MAX_LAG_SECONDS,
+    otherwise to the primary. Never use it for writes.
+    """
+    factory = ReplicaSessionLocal if _replica_healthy() else SessionLocal
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Replay lag in seconds; 0 when the replica has replayed everything it received,
+# so an idle primary does not look like lag. That shortcut only holds while the
+# WAL receiver is streaming: a disconnected receiver stops advancing the
+# receive LSN too, so NULL (unhealthy) is returned unless it is. The replica
+# user needs pg_read_all_stats (or pg_monitor) to see the receiver status.
+_REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (
+            SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming'
+        ) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+_replica_state = {"checked_at": 0.0, "healthy": False}
+_replica_lock = threading.Lock()
+
+def _replica_healthy() -> bool:
+    if replica_engine is None:
+        return False
+    now = time.monotonic()
+    with _replica_lock:
+        if now - _replica_state["checked_at"] < settings.replica_lag_check_seconds:
+            return _replica_state["healthy"]
+        _replica_state["checked_at"] = now
+    healthy = False
+    lag = None
+    reason = "unreachable"
+    try:
+        with replica_engine.connect() as conn:
+            lag = conn.execute(_REPLICA_LAG_SQL).scalar()
+        if lag is None:
+            reason = "wal receiver not streaming"
+        else:
+            lag = float(lag)
+            healthy = lag <= settings.replica_max_lag_seconds
+            reason = None if healthy else "lag"
+    except Exception:
+        logger.exception("Replica lag check failed")
+    with _replica_lock:
+        if healthy != _replica_state["healthy"]:
+            logger.warning(
+                "Replica routing changed",
+                extra={"healthy": healthy, "lag_seconds": lag, "reason": reason},
+            )
+        _replica_state["healthy"] = healthy
+    return healthy
@@ -0,0 +1,130 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import Receive, Scope, Send
+
+_MAX_TRACKED_ETAGS = 256
+
+
+class _RouteStats:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_sent = 0
+        self.bytes_saved = 0
+        self.sizes: OrderedDict[str, int] = OrderedDict()
+
+
+_stats: dict[str, _RouteStats] = {}
+_stats_lock = threading.Lock()
+
+
+def etag_for(request: Request, *validator: Any) -> str:
+    """
+    Weak ETag from a validator (counts and max timestamps scoped to what the
+    response shows) plus the query string, so each page
+    and filter combination is cached separately.
+    """
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    digest = hashlib.sha1(repr((request.url.path, query, validator)).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    route: str,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+) -> Optional[Response]:
+    """
+    Attach validators to `response` and return a 304 response when the
+    client's copy is current. Endpoints return the 304 as-is; otherwise
+    they return their body as usual.
+    """
+    request.state.cache_route = route
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    response.headers.update(headers)
+
+    if _is_current(request, etag, last_modified):
+        with _stats_lock:
+            stats = _stats.setdefault(route, _RouteStats())
+            stats.requests += 1
+            stats.not_modified += 1
+            stats.bytes_saved += stats.sizes.get(etag, 0)
+        return Response(status_code=304, headers=headers)
+    return None
+
+
+def record_response(request: Request, response: Response, size: Optional[int]) -> None:
+    """Called by the HTTP middleware for full responses of cached routes."""
+    route = getattr(request.state, "cache_route", None)
+    if not route or response.status_code != 200:
+        return
+    etag = response.headers.get("etag")
+    with _stats_lock:
+        stats = _stats.setdefault(route, _RouteStats())
+        stats.requests += 1
+        if size:
+            stats.bytes_sent += size
+            if etag:
+                stats.sizes[etag] = size
+                stats.sizes.move_to_end(etag)
+                while len(stats.sizes) > _MAX_TRACKED_ETAGS:
+                    stats.sizes.popitem(last=False)
+
+
+def cache_stats() -> list[dict[str, Any]]:
+    with _stats_lock:
+        return [
+            {
+                "route": route,
+                "requests": stats.requests,
+                "not_modified": stats.not_modified,
+                "not_modified_ratio": round(stats.not_modified / stats.requests, 4) if stats.requests else 0.0,
+                "bytes_sent": stats.bytes_sent,
+                "bytes_saved": stats.bytes_saved,
+            }
+            for route, stats in sorted(_stats.items())
+        ]
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """GZip for JSON responses, skipping streams that must flush per event."""
+
+    def __init__(self, app, minimum_size: int = 1000, exclude_paths: tuple[str, ...] = ()) -> None:
+        super().__init__(app, minimum_size=minimum_size, compresslevel=6)
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope.get("path", "").startswith(self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+def _is_current(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip() for tag in if_none_match.split(",")}
+        return "*" in candidates or etag in candidates or etag.removeprefix("W/") in candidates
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+    return False
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
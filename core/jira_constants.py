@@ -9,3 +9,27 @@ PRIORITY_MAPPING = {
     "P3": "10003",
     "P4": "10004",
 }
+
+# Jira statusCategory keys; tickets in OPEN_STATUS_CATEGORIES count as open.
+OPEN_STATUS_CATEGORIES = ("new", "indeterminate")
+DONE_STATUS_CATEGORY = "done"
+STATUS_CATEGORIES = OPEN_STATUS_CATEGORIES + (DONE_STATUS_CATEGORY,)
+
+# Fallback for issues without a usable statusCategory, keyed by lower-cased
+# status name. Anything else is treated as in progress, so it stays open.
+STATUS_CATEGORY_BY_NAME = {
+    "open": "new",
+    "to do": "new",
+    "new": "new",
+    "backlog": "new",
+    "reopened": "new",
+    "waiting for support": "new",
+    "done": "done",
+    "closed": "done",
+    "resolved": "done",
+    "completed": "done",
+    "cancelled": "done",
+    "canceled": "done",
+    "declined": "done",
+    "rejected": "done",
+}
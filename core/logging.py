@@ -1,10 +1,20 @@
+import atexit
 import contextvars
+import copy
 import json
 import logging
 import logging.config
+import logging.handlers
 import os
+import queue
+import time
+import zlib
 from datetime import datetime, timezone
 
+import orjson
+
+from core.prometheus import LOG_RECORDS_DROPPED, child
+
 _BUILTIN_ATTRS = {
     "args",
     "asctime",
@@ -28,12 +38,32 @@ _BUILTIN_ATTRS = {
     "stack_info",
     "thread",
     "threadName",
+    "taskName",
+    "trace_context",
 }
 
 _trace_id_var = contextvars.ContextVar("trace_id", default=None)
 _span_id_var = contextvars.ContextVar("span_id", default=None)
 _trace_sampled_var = contextvars.ContextVar("trace_sampled", default=None)
+# Whether the trace id resolves in Cloud Trace: it came from the upstream
+# header, or the trace's spans are exported. Locally minted ids that only
+# group log lines are not linked.
+_trace_linked_var = contextvars.ContextVar("trace_linked", default=False)
 _project_id: str | None = None
+_listener: logging.handlers.QueueListener | None = None
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+# Bounds the rate-cap table if a caller logs pre-formatted (f-string) messages.
+_MAX_TEMPLATES = 4096
+
+
+def _trace_context(record: logging.LogRecord) -> tuple:
+    # Captured by ContextQueueHandler on the logging thread; read directly
+    # when a record is formatted without going through the queue.
+    captured = getattr(record, "trace_context", None)
+    if captured is not None:
+        return captured
+    return _trace_id_var.get(), _span_id_var.get(), _trace_sampled_var.get(), _trace_linked_var.get()
 
 
 class JsonFormatter(logging.Formatter):
@@ -42,16 +72,14 @@ class JsonFormatter(logging.Formatter):
             "severity": record.levelname,
             "message": record.getMessage(),
             "logger": record.name,
-            "time": datetime.now(timezone.utc).isoformat(),
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
         }
 
-        trace_id = _trace_id_var.get()
-        span_id = _span_id_var.get()
-        sampled = _trace_sampled_var.get()
+        trace_id, span_id, sampled, linked = _trace_context(record)
 
         if trace_id:
             project = _project_id or os.getenv("GOOGLE_CLOUD_PROJECT") or os.getenv("GCP_PROJECT")
-            if project:
+            if project and linked:
                 payload["trace"] = f"projects/{project}/traces/{trace_id}"
             payload["traceId"] = trace_id
         if span_id:
@@ -65,20 +93,112 @@ class JsonFormatter(logging.Formatter):
         for key, value in record.__dict__.items():
             if key in _BUILTIN_ATTRS:
                 continue
-            payload[key] = _safe_json_value(value)
+            payload[key] = value
 
-        return json.dumps(payload, ensure_ascii=False)
+        return encode_json(payload)
 
 
-def _safe_json_value(value):
+def encode_json(payload: dict) -> str:
+    """
+    Serialize a log payload in one pass. Values orjson cannot encode are
+    stringified; anything it rejects outright (e.g. integers wider than
+    64 bits) falls back to the stdlib encoder.
+    """
     try:
-        json.dumps(value)
-        return value
-    except TypeError:
-        return str(value)
+        return orjson.dumps(payload, default=str, option=_ORJSON_OPTIONS).decode("utf-8")
+    except orjson.JSONEncodeError:
+        return json.dumps(payload, ensure_ascii=False, default=str, separators=(",", ":"))
+
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to the QueueListener thread, which formats and writes them.
+
+    prepare() runs on the logging thread: it renders the message from its
+    arguments and captures the trace context, which lives in contextvars the
+    listener thread cannot see. Formatting and I/O happen on the listener.
+    exc_info is kept (the queue never leaves the process) so tracebacks are
+    also formatted off the calling thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        record.trace_context = (
+            _trace_id_var.get(),
+            _span_id_var.get(),
+            _trace_sampled_var.get(),
+            _trace_linked_var.get(),
+        )
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Thins out high-volume DEBUG/INFO records; WARNING and above always pass.
+
+    Sampling is deterministic per trace_id, so a request keeps either all of
+    its lines or none of them. Records logged outside a request (startup,
+    scheduler jobs) are not sampled, and traces marked as sampled, by the
+    trace header or by core.tracing, are always kept. Separately, each
+    message template (logger name plus the unformatted msg, and the span
+    name for "Span" records) is capped at `rate_limit` records per window,
+    sampled traces included, so an upstream o=1 cannot lift the cap.
+    Dropped records are counted by reason in log_records_dropped_total.
+
+    State is updated without a lock; racing threads can at worst let a few
+    extra records past a cap.
+    """
+
+    def __init__(self, sample_rate: float = 1.0, rate_limit: int = 0, window_seconds: float = 60.0) -> None:
+        super().__init__()
+        self.threshold = int(max(0.0, min(sample_rate, 1.0)) * 0x10000)
+        self.rate_limit = rate_limit
+        self.window_seconds = window_seconds
+        self._windows: dict[tuple[str, str, str | None], list] = {}
+        self._dropped_sampled = child(LOG_RECORDS_DROPPED, "sampled")
+        self._dropped_rate_limited = child(LOG_RECORDS_DROPPED, "rate_limited")
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        trace_id, _, sampled, _ = _trace_context(record)
+        if not sampled and self.threshold < 0x10000 and not self._sampled(trace_id):
+            self._dropped_sampled.inc()
+            return False
+        if self.rate_limit > 0 and not self._within_cap(record):
+            self._dropped_rate_limited.inc()
+            return False
+        return True
+
+    def _sampled(self, trace_id: str | None) -> bool:
+        if not trace_id:
+            return True
+        return zlib.crc32(trace_id.encode("utf-8")) & 0xFFFF < self.threshold
 
+    def _within_cap(self, record: logging.LogRecord) -> bool:
+        # Spans share one template; keyed by span name, one chatty kind
+        # (db.query) cannot use up the budget of the others.
+        key = (record.name, str(record.msg), getattr(record, "span_name", None))
+        now = time.monotonic()
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= self.window_seconds:
+            if len(self._windows) >= _MAX_TEMPLATES:
+                self._windows = {}
+            self._windows[key] = [now, 1]
+            return True
+        window[1] += 1
+        return window[1] <= self.rate_limit
 
-def setup_logging(level: str = "INFO", project_id: str | None = None) -> None:
+
+def setup_logging(
+    level: str = "INFO",
+    project_id: str | None = None,
+    sample_rate: float = 1.0,
+    rate_limit_per_minute: int = 0,
+) -> None:
     global _project_id
     _project_id = project_id
     env = (os.getenv("ENVIRONMENT") or "development").lower()
@@ -106,23 +226,90 @@ def setup_logging(level: str = "INFO", project_id: str | None = None) -> None:
             }
         },
         "root": {"level": level, "handlers": ["stdout"]},
-        "loggers": {
-            "uvicorn": {"level": level, "handlers": ["stdout"], "propagate": False},
-            "uvicorn.error": {"level": level, "handlers": ["stdout"], "propagate": False},
-            "uvicorn.access": {"level": "WARNING", "handlers": ["stdout"], "propagate": False},
-        },
     }
-
     logging.config.dictConfig(config)
 
+    # Loggers only enqueue; one listener thread formats and writes to stdout,
+    # so log I/O never blocks the event loop.
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+    root = logging.getLogger()
+    stdout_handler = root.handlers[0]
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = ContextQueueHandler(log_queue)
+    if sample_rate < 1.0 or rate_limit_per_minute > 0:
+        queue_handler.addFilter(SamplingFilter(sample_rate, rate_limit_per_minute))
+    _listener = logging.handlers.QueueListener(log_queue, stdout_handler, respect_handler_level=True)
+    _listener.start()
+
+    root.handlers = [queue_handler]
+    for name, logger_level in (
+        ("uvicorn", level),
+        ("uvicorn.error", level),
+        ("uvicorn.access", "WARNING"),
+    ):
+        logger = logging.getLogger(name)
+        logger.setLevel(logger_level)
+        logger.handlers = [queue_handler]
+        logger.propagate = False
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
 
-def set_trace_context(trace_id: str | None, span_id: str | None, sampled: bool | None) -> None:
+
+def set_trace_context(
+    trace_id: str | None,
+    span_id: str | None,
+    sampled: bool | None,
+    linked: bool = False,
+) -> None:
     _trace_id_var.set(trace_id)
     _span_id_var.set(span_id)
     _trace_sampled_var.set(sampled)
+    _trace_linked_var.set(linked)
 
 
 def clear_trace_context() -> None:
     _trace_id_var.set(None)
     _span_id_var.set(None)
     _trace_sampled_var.set(None)
+    _trace_linked_var.set(False)
+
+
+def get_trace_context() -> tuple[str | None, str | None, bool | None]:
+    return _trace_id_var.get(), _span_id_var.get(), _trace_sampled_var.get()
+
+
+def push_trace_context(
+    trace_id: str | None,
+    span_id: str | None,
+    sampled: bool | None,
+    linked: bool | None = None,
+) -> tuple:
+    """
+    Like set_trace_context, but returns tokens for pop_trace_context. A
+    `linked` of None keeps the current value, for spans within the trace.
+    """
+    return (
+        _trace_id_var.set(trace_id),
+        _span_id_var.set(span_id),
+        _trace_sampled_var.set(sampled),
+        _trace_linked_var.set(_trace_linked_var.get() if linked is None else linked),
+    )
+
+
+def pop_trace_context(tokens: tuple) -> None:
+    trace_token, span_token, sampled_token, linked_token = tokens
+    _trace_linked_var.reset(linked_token)
+    _trace_sampled_var.reset(sampled_token)
+    _span_id_var.reset(span_token)
+    _trace_id_var.reset(trace_token)
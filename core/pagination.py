@@ -0,0 +1,68 @@
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Optional, Sequence, TypeVar
+
+from fastapi import HTTPException, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+T = TypeVar("T")
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    payload = [_dump(value) for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, *kinds: type) -> tuple:
+    """
+    Decode a cursor produced by encode_cursor. `kinds` gives the expected
+    type of each key part (datetime, uuid.UUID or str); None is kept as is.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(kinds):
+            raise ValueError("cursor shape mismatch")
+        return tuple(_load(value, kind) for value, kind in zip(payload, kinds))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def set_next_cursor(
+    response: Response,
+    rows: Sequence[T],
+    limit: int,
+    key: Callable[[T], tuple],
+) -> Optional[str]:
+    """Expose the next-page cursor in a response header when the page is full."""
+    if not rows or len(rows) < limit:
+        return None
+    cursor = encode_cursor(*key(rows[-1]))
+    response.headers[NEXT_CURSOR_HEADER] = cursor
+    return cursor
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _load(value: Any, kind: type) -> Any:
+    if value is None:
+        return None
+    if kind is datetime:
+        return datetime.fromisoformat(value)
+    if kind is uuid.UUID:
+        return uuid.UUID(value)
+    if not isinstance(value, kind):
+        raise ValueError("unexpected cursor value")
+    return value
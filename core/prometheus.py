@@ -0,0 +1,159 @@
+import functools
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterator, Optional, TypeVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# With several uvicorn workers, PROMETHEUS_MULTIPROC_DIR must point at an
+# empty directory shared by all of them; every worker writes its samples to
+# mmap files there and /metrics aggregates them. Without it, each process
+# reports only its own samples.
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+_FAST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_SLOW_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+    buckets=_FAST_BUCKETS,
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled.",
+    multiprocess_mode="livesum",
+)
+WEBHOOK_DURATION = Histogram(
+    "webhook_duration_seconds",
+    "Webhook handling time from receipt to response, including the agent and reply.",
+    ("platform", "status"),
+    buckets=_SLOW_BUCKETS,
+)
+WEBHOOKS_IN_FLIGHT = Gauge(
+    "webhooks_in_flight",
+    "Webhooks currently being handled.",
+    ("platform",),
+    multiprocess_mode="livesum",
+)
+AGENT_RUN_DURATION = Histogram(
+    "agent_run_duration_seconds",
+    "Runner.run duration for the omnichannel agent.",
+    ("status",),
+    buckets=_SLOW_BUCKETS,
+)
+AGENT_RUNS_IN_FLIGHT = Gauge(
+    "agent_runs_in_flight",
+    "Agent runs currently in progress.",
+    multiprocess_mode="livesum",
+)
+JIRA_REQUEST_DURATION = Histogram(
+    "jira_request_duration_seconds",
+    "JiraService call duration by method.",
+    ("method", "status"),
+    buckets=_FAST_BUCKETS,
+)
+JIRA_REQUESTS_IN_FLIGHT = Gauge(
+    "jira_requests_in_flight",
+    "JiraService calls currently in progress.",
+    multiprocess_mode="livesum",
+)
+SEND_REPLY_DURATION = Histogram(
+    "send_reply_duration_seconds",
+    "Outbound reply delivery time by platform.",
+    ("platform", "status"),
+    buckets=_FAST_BUCKETS,
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting to check a connection out of the pool.",
+    ("pool",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+DB_CONNECTIONS_IN_USE = Gauge(
+    "db_connections_in_use",
+    "Pooled connections currently checked out.",
+    ("pool",),
+    multiprocess_mode="livesum",
+)
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total",
+    "Log records dropped by the sampling filter.",
+    ("reason",),
+)
+
+# labels() takes the metric's lock on every call, so resolved children are
+# cached here; dict reads and writes are atomic, so the cache itself needs no
+# lock and a racing first call at worst resolves the same child twice.
+_children: dict[tuple, Any] = {}
+
+
+def child(metric: Any, *values: str) -> Any:
+    key = (metric, values)
+    found = _children.get(key)
+    if found is None:
+        found = _children[key] = metric.labels(*values)
+    return found
+
+
+@contextmanager
+def observe(
+    histogram: Any,
+    *labels: str,
+    in_flight: Optional[Any] = None,
+) -> Iterator[None]:
+    """
+    Time a block into `histogram`. The trailing status label is "ok", or
+    "error" when the block raises; `in_flight` is held up for the duration.
+    """
+    if in_flight is not None:
+        in_flight.inc()
+    status = "ok"
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        child(histogram, *labels, status).observe(time.perf_counter() - start)
+        if in_flight is not None:
+            in_flight.dec()
+
+
+T = TypeVar("T")
+
+
+def timed_jira(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """Record a JiraService coroutine method under its own name."""
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        with observe(JIRA_REQUEST_DURATION, func.__name__, in_flight=JIRA_REQUESTS_IN_FLIGHT):
+            return await func(*args, **kwargs)
+
+    return wrapper
+
+
+def render() -> tuple[bytes, str]:
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drop this worker's live gauges from the shared directory on shutdown."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
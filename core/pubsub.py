@@ -0,0 +1,143 @@
+import asyncio
+import json
+import logging
+from typing import Any, Optional
+
+from core.config import settings
+from core.database import engine
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_CHANNEL = "dashboard_messages"
+
+
+class Subscription:
+    """
+    One client's bounded event queue.
+
+    A slow client never blocks the listener: when its queue is full, pending
+    events are dropped and replaced by a single "resync" event telling the
+    client to refetch instead of replaying deltas.
+    """
+
+    def __init__(self, maxsize: int, session_id: Optional[str] = None) -> None:
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=maxsize)
+        self.session_id = session_id
+        self.dropped = 0
+
+    def offer(self, event: dict[str, Any]) -> None:
+        if self.session_id and event.get("session_id") not in (None, self.session_id):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync"})
+
+    async def get(self, timeout: float) -> Optional[dict[str, Any]]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class NotificationHub:
+    """
+    Fans Postgres NOTIFY payloads out to in-process subscribers.
+
+    Each process holds one LISTEN connection, detached from the pool and
+    watched with loop.add_reader, so no thread or polling loop is needed.
+    If the connection drops, the hub reconnects and tells every subscriber
+    to resync.
+    """
+
+    def __init__(self, channel: str, queue_size: int = 100, reconnect_seconds: float = 5.0) -> None:
+        self.channel = channel
+        self.queue_size = queue_size
+        self.reconnect_seconds = reconnect_seconds
+        self._subscribers: set[Subscription] = set()
+        self._conn = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reconnect: Optional[asyncio.Task] = None
+
+    def subscribe(self, session_id: Optional[str] = None) -> Subscription:
+        subscription = Subscription(self.queue_size, session_id)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        try:
+            await asyncio.to_thread(self._connect)
+        except Exception:
+            logger.exception("Notification listener connect failed", extra={"channel": self.channel})
+            self._schedule_reconnect()
+            return
+        self._loop.add_reader(self._conn.fileno(), self._on_readable)
+        logger.info("Notification listener started", extra={"channel": self.channel})
+
+    async def stop(self) -> None:
+        if self._reconnect:
+            self._reconnect.cancel()
+            self._reconnect = None
+        self._close()
+
+    def _connect(self) -> None:
+        pooled = engine.raw_connection()
+        pooled.detach()
+        conn = pooled.dbapi_connection
+        conn.autocommit = True
+        cursor = conn.cursor()
+        cursor.execute(f'LISTEN "{self.channel}"')
+        cursor.close()
+        self._conn = conn
+
+    def _close(self) -> None:
+        if self._conn is None:
+            return
+        if self._loop:
+            self._loop.remove_reader(self._conn.fileno())
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+    def _on_readable(self) -> None:
+        try:
+            self._conn.poll()
+        except Exception:
+            logger.exception("Notification listener connection lost", extra={"channel": self.channel})
+            self._close()
+            self._broadcast({"type": "resync"})
+            self._schedule_reconnect()
+            return
+        while self._conn.notifies:
+            notify = self._conn.notifies.pop(0)
+            try:
+                event = json.loads(notify.payload)
+            except ValueError:
+                logger.warning("Notification payload invalid", extra={"channel": notify.channel})
+                continue
+            self._broadcast(event)
+
+    def _broadcast(self, event: dict[str, Any]) -> None:
+        for subscription in list(self._subscribers):
+            subscription.offer(event)
+
+    def _schedule_reconnect(self) -> None:
+        if self._loop and not self._reconnect:
+            self._reconnect = self._loop.create_task(self._reconnect_later())
+
+    async def _reconnect_later(self) -> None:
+        await asyncio.sleep(self.reconnect_seconds)
+        self._reconnect = None
+        await self.start()
+
+
+notification_hub = NotificationHub(MESSAGE_CHANNEL, queue_size=settings.stream_queue_size)
@@ -0,0 +1,134 @@
+import contextvars
+import logging
+import re
+import time
+from collections import Counter
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+# Expanded IN lists render one placeholder per value; collapse them so the
+# shape does not depend on the list length.
+_PLACEHOLDER_RUN = re.compile(r"%\((\w+?)_\d+\)s(?:\s*,\s*%\(\1_\d+\)s)+")
+_MAX_STATEMENT_CHARS = 2000
+_MAX_CACHED_SHAPES = 2048
+_shape_cache: dict[str, str] = {}
+
+
+class QueryStats:
+    """Queries issued while handling one request."""
+
+    __slots__ = ("count", "total_seconds", "shapes")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_seconds = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    def most_repeated(self) -> tuple[Optional[str], int]:
+        if not self.shapes:
+            return None, 0
+        return self.shapes.most_common(1)[0]
+
+
+# Holds a mutable QueryStats, so queries run in worker threads (sync
+# endpoints, asyncio.to_thread) add to the request that started them.
+_stats_var: contextvars.ContextVar[Optional[QueryStats]] = contextvars.ContextVar(
+    "query_stats", default=None
+)
+
+
+def start_request() -> contextvars.Token:
+    return _stats_var.set(QueryStats())
+
+
+def finish_request(token: contextvars.Token) -> Optional[QueryStats]:
+    stats = _stats_var.get()
+    _stats_var.reset(token)
+    return stats
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _stats_var.get()
+
+
+def statement_shape(statement: str) -> str:
+    shape = _shape_cache.get(statement)
+    if shape is None:
+        if len(_shape_cache) >= _MAX_CACHED_SHAPES:
+            _shape_cache.clear()
+        shape = _PLACEHOLDER_RUN.sub(r"%(\1_n)s", _WHITESPACE.sub(" ", statement).strip())
+        _shape_cache[statement] = shape
+    return shape
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """Keep parameter names and types only; values may hold personal data."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return {"rows": len(parameters), "first": redact_parameters(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info["query_started"].pop()
+    elapsed = time.perf_counter() - started
+
+    stats = _stats_var.get()
+    if stats is not None:
+        stats.count += 1
+        stats.total_seconds += elapsed
+        stats.shapes[statement_shape(statement)] += 1
+
+    if elapsed * 1000 >= settings.slow_query_ms:
+        logger.warning(
+            "Slow query",
+            extra={
+                "elapsed_ms": round(elapsed * 1000, 1),
+                "statement": statement_shape(statement)[:_MAX_STATEMENT_CHARS],
+                "parameters": redact_parameters(parameters),
+                "executemany": executemany,
+                "rowcount": getattr(cursor, "rowcount", None),
+            },
+        )
+
+
+def _handle_error(exception_context) -> None:
+    # after_cursor_execute does not fire for a failed statement.
+    started = exception_context.connection.info.get("query_started") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+def install(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def log_request_queries(stats: QueryStats, route: str) -> None:
+    """Flag a request that ran the same statement shape too many times."""
+    statement, repeats = stats.most_repeated()
+    if repeats > settings.n_plus_one_threshold:
+        logger.warning(
+            "Repeated query shape, possible N+1",
+            extra={
+                "route": route,
+                "repeats": repeats,
+                "db_queries": stats.count,
+                "statement": statement[:_MAX_STATEMENT_CHARS],
+            },
+        )
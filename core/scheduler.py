@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import random
+import time
+import zlib
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Dict, List
+
+from sqlalchemy import text
+
+from core.database import engine
+from core.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    name: str
+    func: Callable[[], Awaitable[None]]
+    interval_seconds: float
+    jitter_seconds: float = 0.0
+    initial_delay_seconds: float = 0.0
+    # Exclusive jobs take a Postgres advisory lock and record their start in
+    # scheduler_job_runs, so across replicas they run once per interval.
+    exclusive: bool = True
+
+
+class Scheduler:
+    """
+    Runs periodic jobs as background tasks on the event loop.
+
+    Each job has its own interval and jitter. A job never overlaps with
+    itself inside a process, and exclusive jobs are additionally guarded by
+    a session-level advisory lock. Under the lock, the job's last start is
+    read from scheduler_job_runs and the tick is skipped when another
+    replica (or a manual sync) started it less than an interval ago, so N
+    replicas still run it once per interval.
+    """
+
+    def __init__(self) -> None:
+        self._jobs: Dict[str, Job] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._running: set[str] = set()
+
+    def add_job(self, job: Job) -> None:
+        if job.name in self._jobs:
+            raise ValueError(f"Job already registered: {job.name}")
+        self._jobs[job.name] = job
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        for job in self._jobs.values():
+            self._tasks.append(asyncio.create_task(self._loop(job), name=f"scheduler:{job.name}"))
+        logger.info("Scheduler started", extra={"jobs": ", ".join(self._jobs)})
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def run_now(self, name: str) -> bool:
+        job = self._jobs.get(name)
+        if not job:
+            raise KeyError(name)
+        return await self._run_once(job)
+
+    async def _loop(self, job: Job) -> None:
+        await asyncio.sleep(job.initial_delay_seconds + self._jitter(job))
+        while True:
+            await self._run_once(job)
+            await asyncio.sleep(job.interval_seconds + self._jitter(job))
+
+    def _jitter(self, job: Job) -> float:
+        return random.uniform(0, job.jitter_seconds) if job.jitter_seconds > 0 else 0.0
+
+    async def _run_once(self, job: Job) -> bool:
+        if job.name in self._running:
+            logger.info("Scheduler job still running, skipped", extra={"job": job.name})
+            return False
+
+        self._running.add(job.name)
+        start = time.perf_counter()
+        try:
+            if job.exclusive:
+                async with advisory_lock(job.name) as acquired:
+                    if not acquired:
+                        logger.info("Scheduler job locked by another instance", extra={"job": job.name})
+                        return False
+                    if not await asyncio.to_thread(claim_run, job.name, job.interval_seconds):
+                        logger.info("Scheduler job ran recently, skipped", extra={"job": job.name})
+                        return False
+                    with span(f"scheduler.{job.name}"):
+                        await job.func()
+            else:
+                with span(f"scheduler.{job.name}"):
+                    await job.func()
+            logger.info(
+                "Scheduler job completed",
+                extra={"job": job.name, "elapsed_s": round(time.perf_counter() - start, 3)},
+            )
+            return True
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Scheduler job failed", extra={"job": job.name})
+            return False
+        finally:
+            self._running.discard(job.name)
+
+
+def _lock_key(name: str) -> int:
+    return zlib.crc32(f"scheduler:{name}".encode("utf-8"))
+
+
+@asynccontextmanager
+async def advisory_lock(name: str) -> AsyncIterator[bool]:
+    """
+    Try to take a session-level advisory lock on a dedicated connection.
+    The lock is released on exit, or by Postgres if the process dies.
+    """
+    key = _lock_key(name)
+
+    def acquire():
+        conn = engine.connect()
+        try:
+            acquired = bool(conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key}).scalar())
+            conn.commit()
+        except Exception:
+            conn.close()
+            raise
+        return conn, acquired
+
+    def release(conn, acquired: bool) -> None:
+        try:
+            if acquired:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+                conn.commit()
+        finally:
+            conn.close()
+
+    conn, acquired = await asyncio.to_thread(acquire)
+    try:
+        yield acquired
+    finally:
+        await asyncio.to_thread(release, conn, acquired)
+
+
+# Records the start only when the previous one is at least `interval` old.
+# Database time is used on both sides, so replica clock skew does not matter.
+_CLAIM_RUN = """
+INSERT INTO scheduler_job_runs (job_name, last_started_at)
+VALUES (:name, now())
+ON CONFLICT (job_name) DO UPDATE SET last_started_at = now()
+WHERE scheduler_job_runs.last_started_at <= now() - make_interval(secs => :interval)
+"""
+
+
+def claim_run(name: str, interval_seconds: float = 0) -> bool:
+    """
+    Record a start of `name` unless it started less than `interval_seconds`
+    ago. Call while holding advisory_lock(name). Returns whether to run.
+    """
+    with engine.begin() as conn:
+        result = conn.execute(text(_CLAIM_RUN), {"name": name, "interval": interval_seconds})
+        return bool(result.rowcount)
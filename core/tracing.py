@@ -0,0 +1,351 @@
+import asyncio
+import functools
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+import requests
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from core.config import settings
+from core.logging import get_trace_context, pop_trace_context, push_trace_context
+
+logger = logging.getLogger(__name__)
+
+_OTLP_BATCH_SIZE = 512
+_OTLP_FLUSH_SECONDS = 2.0
+_MAX_STATEMENT_CHARS = 500
+
+
+def new_trace_id() -> str:
+    return os.urandom(16).hex()
+
+
+def new_span_id() -> str:
+    return os.urandom(8).hex()
+
+
+def header_span_id(value: Optional[str]) -> Optional[str]:
+    """X-Cloud-Trace-Context carries a decimal span id; spans use 16 hex chars."""
+    if not value:
+        return None
+    try:
+        return format(int(value) & 0xFFFFFFFFFFFFFFFF, "016x")
+    except ValueError:
+        return None
+
+
+def exports_spans() -> bool:
+    """Sampled spans leave the process, so their trace ids resolve in a trace backend."""
+    return settings.trace_exporter == "otlp" and bool(settings.trace_otlp_endpoint)
+
+
+def head_sample(upstream: Optional[bool]) -> bool:
+    """Honour the caller's sampling decision; otherwise sample at TRACE_SAMPLE_RATE."""
+    if upstream is not None:
+        return upstream
+    return random.random() < settings.trace_sample_rate
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "kind", "attributes", "start_ns", "end_ns", "error")
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        kind: str,
+        attributes: dict[str, Any],
+    ) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = new_span_id()
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"[:500]
+        _exporter().export(self)
+
+
+def start_span(name: str, kind: str = "internal", root: bool = True, **attributes: Any) -> Optional[Span]:
+    """
+    Start a child of the current span. Without a trace context (scheduler
+    jobs, startup) a new head-sampled trace is started, unless `root` is
+    False. Returns None for unsampled traces, so the untraced path costs a
+    contextvar read. The span is not made current; use span() for blocks
+    that have children of their own.
+    """
+    if settings.trace_exporter == "none":
+        return None
+    trace_id, parent_id, sampled = get_trace_context()
+    if trace_id is None:
+        if not root or not head_sample(None):
+            return None
+        trace_id = new_trace_id()
+    elif not sampled:
+        return None
+    return Span(name, trace_id, parent_id, kind, attributes)
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes: Any) -> Iterator[Optional[Span]]:
+    """Time a block as a span; logs and spans inside it become its children."""
+    current = start_span(name, kind, **attributes)
+    if current is None:
+        yield None
+        return
+    # A span that started its own trace decides whether log lines link to it.
+    new_trace = get_trace_context()[0] != current.trace_id
+    tokens = push_trace_context(
+        current.trace_id,
+        current.span_id,
+        True,
+        exports_spans() if new_trace else None,
+    )
+    try:
+        yield current
+    except BaseException as exc:
+        current.finish(exc)
+        raise
+    else:
+        current.finish()
+    finally:
+        pop_trace_context(tokens)
+
+
+def traced(name: Optional[str] = None, kind: str = "internal") -> Callable:
+    """Decorator form of span(); defaults to the function's qualified name."""
+
+    def decorate(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(span_name, kind):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(span_name, kind):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    current = start_span("db.query", "client", root=False, statement=statement[:_MAX_STATEMENT_CHARS])
+    conn.info.setdefault("trace_spans", []).append(current)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    current = conn.info["trace_spans"].pop()
+    if current is not None:
+        current.set_attribute("rowcount", getattr(cursor, "rowcount", None))
+        current.finish()
+
+
+def _handle_error(exception_context) -> None:
+    spans = exception_context.connection.info.get("trace_spans") if exception_context.connection else None
+    if spans:
+        current = spans.pop()
+        if current is not None:
+            current.finish(exception_context.original_exception)
+
+
+def install_db_spans(engine: Engine) -> None:
+    """One client span per SQL statement, under whatever span issued it."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class LogExporter:
+    """Writes each finished span as a structured "Span" log record."""
+
+    def export(self, span: Span) -> None:
+        # Logged in the span's own context so the record carries its ids and
+        # passes log sampling like the rest of the sampled trace; the
+        # per-template rate cap still applies, per span name.
+        tokens = push_trace_context(span.trace_id, span.span_id, True)
+        try:
+            self._log(span)
+        finally:
+            pop_trace_context(tokens)
+
+    def _log(self, span: Span) -> None:
+        logger.info(
+            "Span",
+            extra={
+                "parentSpanId": span.parent_id,
+                "span_name": span.name,
+                "span_kind": span.kind,
+                "duration_ms": round((span.end_ns - span.start_ns) / 1e6, 3),
+                "span_status": "error" if span.error else "ok",
+                "span_error": span.error,
+                "attributes": span.attributes,
+            },
+        )
+
+    def shutdown(self) -> None:
+        pass
+
+
+_OTLP_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+
+class OtlpExporter:
+    """
+    Batches spans to an OTLP/HTTP JSON endpoint (e.g. a local collector on
+    :4318/v1/traces) from a background thread. export() only enqueues.
+    Spans are dropped, not retried, when the collector is unavailable.
+    """
+
+    def __init__(self, endpoint: str, service_name: str) -> None:
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._start_lock = threading.Lock()
+        self._failing = False
+
+    def export(self, span: Span) -> None:
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="otlp-exporter", daemon=True)
+                    self._thread.start()
+        self._queue.put(span)
+
+    def shutdown(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=_OTLP_FLUSH_SECONDS * 2)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            batch = self._drain(timeout=_OTLP_FLUSH_SECONDS)
+            if batch:
+                self._post(batch)
+        batch = self._drain(timeout=0)
+        if batch:
+            self._post(batch)
+
+    def _drain(self, timeout: float) -> list[Span]:
+        batch: list[Span] = []
+        deadline = time.monotonic() + timeout
+        while len(batch) < _OTLP_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _post(self, batch: list[Span]) -> None:
+        try:
+            response = requests.post(self.endpoint, json=self._payload(batch), timeout=5)
+            response.raise_for_status()
+            self._failing = False
+        except requests.exceptions.RequestException:
+            # One warning per outage rather than one per batch.
+            if not self._failing:
+                logger.warning(
+                    "OTLP span export failed",
+                    exc_info=True,
+                    extra={"endpoint": self.endpoint, "spans": len(batch)},
+                )
+            self._failing = True
+
+    def _payload(self, batch: list[Span]) -> dict:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [_otlp_span(span) for span in batch],
+                        }
+                    ],
+                }
+            ]
+        }
+
+
+def _otlp_span(span: Span) -> dict:
+    record = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": _OTLP_KINDS.get(span.kind, 1),
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": _otlp_attributes(span.attributes),
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id:
+        record["parentSpanId"] = span.parent_id
+    return record
+
+
+def _otlp_attributes(values: dict[str, Any]) -> list[dict]:
+    attributes = []
+    for key, value in values.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        attributes.append({"key": key, "value": typed})
+    return attributes
+
+
+_active_exporter: Optional[Any] = None
+_exporter_lock = threading.Lock()
+
+
+def _exporter() -> Any:
+    global _active_exporter
+    if _active_exporter is None:
+        with _exporter_lock:
+            if _active_exporter is None:
+                if settings.trace_exporter == "otlp" and settings.trace_otlp_endpoint:
+                    _active_exporter = OtlpExporter(settings.trace_otlp_endpoint, settings.trace_service_name)
+                else:
+                    _active_exporter = LogExporter()
+    return _active_exporter
+
+
+def shutdown_tracing() -> None:
+    """Flush spans still queued for the OTLP collector."""
+    if _active_exporter is not None:
+        _active_exporter.shutdown()
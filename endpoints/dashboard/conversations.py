@@ -1,19 +1,27 @@
+import uuid
 from datetime import datetime, timezone
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy import desc, func, or_, text
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import desc, func, or_, tuple_
 from sqlalchemy.orm import Session
 
 from adapters.registry import send_reply
-from core.database import get_db
-from models.models import ChannelSession, Message, Organization, TicketLink, User
+from core.database import get_db, get_read_db
+from core.http_cache import conditional_response, etag_for
+from core.pagination import decode_cursor, set_next_cursor
+from models.models import ChannelSession, Organization, TicketLink, User
 from schemas.admin import AdminMessageCreate
 from schemas.message import IncomingMessage
 from services.message_service import MessageService
+from services.organization_service import OrganizationService
+from services.read_mark_service import read_mark_writer
 
 router = APIRouter(prefix="/api", tags=["conversations"])
 
+# Conversation list order; matches ix_channel_sessions_activity_id.
+_ACTIVITY_AT = func.coalesce(ChannelSession.updated_at, ChannelSession.created_at)
+
 
 def _admin_context(request: Request) -> dict:
     admin = getattr(request.state, "admin", None)
@@ -29,63 +37,21 @@ def admin_me(request: Request) -> dict:
 
 @router.get("/conversations")
 def list_conversations(
+    request: Request,
+    response: Response,
     q: Optional[str] = None,
     organization_id: Optional[str] = None,
     channel: Optional[str] = None,
     unread_only: Optional[bool] = False,
     limit: int = 20,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
 ) -> list[dict]:
-    last_message_sub = (
-        db.query(
-            Message.session_id.label("session_id"),
-            Message.content.label("text"),
-            Message.role.label("role"),
-            Message.created_at.label("created_at"),
-            func.row_number()
-            .over(
-                partition_by=Message.session_id,
-                order_by=(Message.created_at.desc(), Message.id.desc()),
-            )
-            .label("rn"),
-        )
-        .subquery()
-    )
-
-    last_message = (
-        db.query(last_message_sub)
-        .filter(last_message_sub.c.rn == 1)
-        .subquery()
-    )
-
-    epoch = text("'1970-01-01'::timestamptz")
-    unread_sub = (
-        db.query(
-            Message.session_id.label("session_id"),
-            func.count(Message.id).label("unread_count"),
-        )
-        .join(ChannelSession, ChannelSession.id == Message.session_id)
-        .filter(Message.role == "user")
-        .filter(Message.created_at > func.coalesce(ChannelSession.last_read_at, epoch))
-        .group_by(Message.session_id)
-        .subquery()
-    )
-
     query = (
-        db.query(
-            ChannelSession,
-            User,
-            Organization,
-            last_message.c.text.label("last_text"),
-            last_message.c.role.label("last_role"),
-            last_message.c.created_at.label("last_created_at"),
-            unread_sub.c.unread_count.label("unread_count"),
-        )
+        db.query(ChannelSession, User, Organization)
         .outerjoin(User, ChannelSession.user_id == User.id)
         .outerjoin(Organization, User.organization_id == Organization.id)
-        .outerjoin(last_message, last_message.c.session_id == ChannelSession.id)
-        .outerjoin(unread_sub, unread_sub.c.session_id == ChannelSession.id)
     )
 
     if organization_id:
@@ -98,21 +64,46 @@ def list_conversations(
             or_(
                 User.email.ilike(like),
                 ChannelSession.external_user_id.ilike(like),
-                last_message.c.text.ilike(like),
+                ChannelSession.last_message_text.ilike(like),
             )
         )
     if unread_only:
-        query = query.filter(func.coalesce(unread_sub.c.unread_count, 0) > 0)
+        query = query.filter(ChannelSession.unread_count > 0)
+    if cursor:
+        after_at, after_id = decode_cursor(cursor, datetime, uuid.UUID)
+        query = query.filter(tuple_(_ACTIVITY_AT, ChannelSession.id) < tuple_(after_at, after_id))
 
+    # One aggregate over the filtered set, joins included; everything the
+    # list renders moves one of these, so a 304 skips the page query.
+    version = query.with_entities(
+        func.count(ChannelSession.id),
+        func.max(_ACTIVITY_AT),
+        func.max(ChannelSession.last_message_at),
+        func.max(ChannelSession.last_read_at),
+        func.sum(ChannelSession.unread_count),
+        func.max(func.coalesce(User.updated_at, User.created_at)),
+        func.max(func.coalesce(Organization.updated_at, Organization.created_at)),
+    ).one()
+    cached = conditional_response(request, response, "conversations", etag_for(request, *version))
+    if cached:
+        return cached
+
+    if not cursor:
+        query = query.offset(offset)
     rows = (
-        query.order_by(desc(ChannelSession.updated_at), desc(ChannelSession.created_at))
+        query.order_by(desc(_ACTIVITY_AT), desc(ChannelSession.id))
         .limit(limit)
-        .offset(offset)
         .all()
     )
+    set_next_cursor(
+        response,
+        rows,
+        limit,
+        lambda row: (row[0].updated_at or row[0].created_at, row[0].id),
+    )
 
     results: list[dict] = []
-    for session, user, org, last_text, last_role, last_created_at, unread_count in rows:
+    for session, user, org in rows:
         results.append(
             {
                 "session_id": str(session.id),
@@ -125,14 +116,14 @@ def list_conversations(
                 "channel": session.platform,
                 "last_message": (
                     {
-                        "text": last_text,
-                        "from": last_role,
-                        "created_at": last_created_at,
+                        "text": session.last_message_text,
+                        "from": session.last_message_role,
+                        "created_at": session.last_message_at,
                     }
-                    if last_text
+                    if session.last_message_text
                     else None
                 ),
-                "unread_count": int(unread_count or 0),
+                "unread_count": session.unread_count or 0,
                 "updated_at": session.updated_at or session.created_at,
             }
         )
@@ -142,7 +133,7 @@ def list_conversations(
 @router.get("/conversations/{session_id}")
 def get_conversation(
     session_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> dict:
     session = db.get(ChannelSession, session_id)
     if not session:
@@ -173,26 +164,36 @@ def get_conversation(
 @router.get("/conversations/{session_id}/messages")
 def list_conversation_messages(
     session_id: str,
+    request: Request,
+    response: Response,
     limit: int = 50,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    mark_read: bool = False,
+    db: Session = Depends(get_read_db),
 ) -> list[dict]:
     session = db.get(ChannelSession, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    messages = (
-        db.query(Message)
-        .filter(Message.session_id == session_id)
-        .order_by(desc(Message.created_at), desc(Message.id))
-        .limit(limit)
-        .offset(offset)
-        .all()
+    if mark_read:
+        read_mark_writer.mark(session.id, datetime.now(timezone.utc))
+
+    message_service = MessageService()
+    count, newest = message_service.get_messages_version(db, session.id)
+    cached = conditional_response(
+        request,
+        response,
+        "conversation_messages",
+        etag_for(request, count, newest),
+        newest,
     )
+    if cached:
+        return cached
 
-    session.last_read_at = datetime.now(timezone.utc)
-    db.add(session)
-    db.commit()
+    before = decode_cursor(cursor, datetime, uuid.UUID) if cursor else None
+    messages = message_service.get_messages_page(db, session.id, limit, offset, before)
+    set_next_cursor(response, messages, limit, lambda message: (message.created_at, message.id))
 
     return [
         {
@@ -206,6 +207,19 @@ def list_conversation_messages(
     ]
 
 
+@router.post("/conversations/{session_id}/read", status_code=202)
+def mark_conversation_read(
+    session_id: str,
+    db: Session = Depends(get_db),
+) -> dict:
+    session = db.get(ChannelSession, session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    read_mark_writer.mark(session.id, datetime.now(timezone.utc))
+    return {"status": "accepted"}
+
+
 @router.post("/conversations/{session_id}/messages")
 def send_admin_message(
     session_id: str,
@@ -248,6 +262,7 @@ def link_ticket(
         raise HTTPException(status_code=400, detail="Session is not linked to a user")
 
     link = db.query(TicketLink).filter(TicketLink.ticket_key == ticket_key).first()
+    previous_organization_id = link.organization_id if link else None
     if link:
         link.session_id = session.id
         link.organization_id = user.organization_id
@@ -260,5 +275,7 @@ def link_ticket(
             platform=session.platform,
         )
     db.add(link)
+    db.flush()
+    OrganizationService().refresh_counters(db, [user.organization_id, previous_organization_id])
     db.commit()
     return {"status": "ok"}
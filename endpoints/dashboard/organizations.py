@@ -1,11 +1,12 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from core.database import get_db
-from models.models import ChannelSession, Organization, TicketLink, User
+from core.database import get_db, get_read_db
+from core.http_cache import conditional_response, etag_for
+from models.models import Organization, User
 from schemas.admin import OrganizationCreate, OrganizationUpdate
 
 router = APIRouter(prefix="/api", tags=["organizations"])
@@ -13,61 +14,56 @@ router = APIRouter(prefix="/api", tags=["organizations"])
 
 @router.get("/organizations")
 def list_organizations(
+    request: Request,
+    response: Response,
     q: Optional[str] = None,
-    db: Session = Depends(get_db),
+    limit: Optional[int] = None,
+    offset: int = 0,
+    db: Session = Depends(get_read_db),
 ) -> list[dict]:
     org_query = db.query(Organization)
     if q:
         like = f"%{q}%"
         org_query = org_query.filter(Organization.name.ilike(like))
 
-    orgs = org_query.order_by(Organization.name).all()
-    org_ids = [org.id for org in orgs]
-
-    user_counts = dict(
-        db.query(User.organization_id, func.count(User.id))
-        .filter(User.organization_id.in_(org_ids))
-        .group_by(User.organization_id)
-        .all()
-    )
-
-    convo_counts = dict(
-        db.query(Organization.id, func.count(ChannelSession.id))
-        .join(User, User.organization_id == Organization.id)
-        .join(ChannelSession, ChannelSession.user_id == User.id)
-        .filter(Organization.id.in_(org_ids))
-        .group_by(Organization.id)
-        .all()
-    )
-
-    ticket_counts = dict(
-        db.query(TicketLink.organization_id, func.count(TicketLink.id))
-        .filter(TicketLink.organization_id.in_(org_ids))
-        .group_by(TicketLink.organization_id)
-        .all()
-    )
-
-    results = []
-    for org in orgs:
-        results.append(
-            {
-        "organization_id": str(org.id),
-        "jsm_id": org.jsm_id,
-        "jsm_uuid": org.jsm_uuid,
-        "name": org.name,
-        "is_active": org.is_active,
-        "user_count": int(user_counts.get(org.id, 0)),
-        "conversation_count": int(convo_counts.get(org.id, 0)),
-        "ticket_count": int(ticket_counts.get(org.id, 0)),
-    }
-        )
+    # One aggregate over the filtered set, so a 304 skips the list query.
+    version = org_query.with_entities(
+        func.count(Organization.id),
+        func.max(func.coalesce(Organization.updated_at, Organization.created_at)),
+        func.sum(Organization.user_count),
+        func.sum(Organization.conversation_count),
+        func.sum(Organization.ticket_count),
+    ).one()
+    cached = conditional_response(request, response, "organizations", etag_for(request, *version))
+    if cached:
+        return cached
+
+    org_query = org_query.order_by(Organization.name, Organization.id).offset(offset)
+    if limit is not None:
+        org_query = org_query.limit(limit)
+
+    results = [
+        {
+            "organization_id": str(org.id),
+            "jsm_id": org.jsm_id,
+            "jsm_uuid": org.jsm_uuid,
+            "name": org.name,
+            "is_active": org.is_active,
+            "user_count": org.user_count,
+            "conversation_count": org.conversation_count,
+            "ticket_count": org.ticket_count,
+        }
+        for org in org_query.all()
+    ]
     return results
 
 
 @router.get("/organizations/{organization_id}")
 def get_organization(
     organization_id: str,
-    db: Session = Depends(get_db),
+    users_limit: int = 50,
+    users_offset: int = 0,
+    db: Session = Depends(get_read_db),
 ) -> dict:
     org = db.get(Organization, organization_id)
     if not org:
@@ -77,21 +73,10 @@ def get_organization(
         db.query(User)
         .filter(User.organization_id == organization_id)
         .order_by(User.email)
+        .limit(users_limit)
+        .offset(users_offset)
         .all()
     )
-    convo_count = (
-        db.query(func.count(ChannelSession.id))
-        .join(User, ChannelSession.user_id == User.id)
-        .filter(User.organization_id == organization_id)
-        .scalar()
-        or 0
-    )
-    ticket_count = (
-        db.query(func.count(TicketLink.id))
-        .filter(TicketLink.organization_id == organization_id)
-        .scalar()
-        or 0
-    )
     return {
         "organization_id": str(org.id),
         "jsm_id": org.jsm_id,
@@ -108,7 +93,8 @@ def get_organization(
             }
             for user in users
         ],
-        "stats": {"conversations": int(convo_count), "tickets": int(ticket_count)},
+        "users_total": org.user_count,
+        "stats": {"conversations": org.conversation_count, "tickets": org.ticket_count},
     }
 
 
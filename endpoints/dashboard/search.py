@@ -0,0 +1,31 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from core.database import get_read_db
+from services.search_service import SEARCH_TYPES, SearchService
+
+router = APIRouter(prefix="/api", tags=["search"])
+
+
+@router.get("/search")
+def search(
+    q: str,
+    types: Optional[str] = None,
+    limit: int = 20,
+    db: Session = Depends(get_read_db),
+) -> dict:
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=400, detail="q is required")
+
+    selected = SEARCH_TYPES
+    if types:
+        selected = tuple(part.strip() for part in types.split(",") if part.strip())
+        unknown = [part for part in selected if part not in SEARCH_TYPES]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown search types: {', '.join(unknown)}")
+
+    limit = max(1, min(limit, 100))
+    return {"q": q, **SearchService().search(db, q, selected, limit)}
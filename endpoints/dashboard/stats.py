@@ -1,20 +1,66 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import func
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from core.database import get_db
-from models.models import ChannelSession, Organization, TicketLink
+from core.database import get_read_db
+from core.http_cache import cache_stats
+from services.metrics_service import GROUP_BY, METRICS, MetricsService
 
 router = APIRouter(prefix="/api", tags=["stats"])
 
+_MAX_POINTS = 2000
+
 
 @router.get("/stats")
-def admin_stats(db: Session = Depends(get_db)) -> dict:
-    total_conversations = db.query(func.count(ChannelSession.id)).scalar() or 0
-    open_tickets = db.query(func.count(TicketLink.id)).scalar() or 0
-    active_organizations = db.query(func.count(Organization.id)).scalar() or 0
-    return {
-        "total_conversations": int(total_conversations),
-        "open_tickets": int(open_tickets),
-        "active_organizations": int(active_organizations),
-    }
+def admin_stats(db: Session = Depends(get_read_db)) -> dict:
+    return MetricsService().totals(db)
+
+
+@router.get("/stats/http-cache")
+def http_cache_stats() -> list[dict]:
+    return cache_stats()
+
+
+@router.get("/stats/timeseries")
+def stats_timeseries(
+    metric: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    interval: str = "hour",
+    platform: Optional[str] = None,
+    organization_id: Optional[str] = None,
+    group_by: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+) -> dict:
+    if metric not in METRICS:
+        raise HTTPException(status_code=400, detail=f"metric must be one of: {', '.join(METRICS)}")
+    if interval not in {"hour", "day"}:
+        raise HTTPException(status_code=400, detail="interval must be hour or day")
+    if group_by and group_by not in GROUP_BY:
+        raise HTTPException(status_code=400, detail=f"group_by must be one of: {', '.join(GROUP_BY)}")
+
+    end = _as_utc(end) if end else datetime.now(timezone.utc)
+    start = _as_utc(start) if start else end - timedelta(days=1)
+    step = timedelta(hours=1) if interval == "hour" else timedelta(days=1)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    if (end - start) / step > _MAX_POINTS:
+        raise HTTPException(status_code=400, detail="Range too large for interval")
+
+    points = MetricsService().timeseries(
+        db,
+        metric,
+        start,
+        end,
+        interval=interval,
+        platform=platform,
+        organization_id=organization_id,
+        group_by=group_by,
+    )
+    return {"metric": metric, "interval": interval, "start": start, "end": end, "points": points}
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
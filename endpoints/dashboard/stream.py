@@ -0,0 +1,33 @@
+import json
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+
+from core.config import settings
+from core.pubsub import notification_hub
+
+router = APIRouter(prefix="/api", tags=["stream"])
+
+
+@router.get("/stream")
+async def stream(request: Request, session_id: Optional[str] = None) -> StreamingResponse:
+    subscription = notification_hub.subscribe(session_id)
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.get(settings.stream_keepalive_seconds)
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event.get('type', 'message')}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            notification_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,15 +1,22 @@
+import uuid
 from typing import Optional
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import desc, or_
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import and_, func, or_, tuple_
 from sqlalchemy.orm import Session
 
 from core.config import settings
-from core.database import get_db
-from models.models import ChannelSession, JiraTicket, Message, Organization, TicketLink, User
+from core.database import get_db, get_read_db
+from core.jira_constants import DONE_STATUS_CATEGORY, OPEN_STATUS_CATEGORIES
+from core.http_cache import conditional_response, etag_for
+from core.pagination import decode_cursor, set_next_cursor
+from models.models import ChannelSession, JiraTicket, Organization, TicketLink, User
 from schemas.admin import AdminCommentCreate
 from services.jira_service import JiraService
+from services.message_service import MessageService
+from services.read_mark_service import read_mark_writer
+from services.search_service import ts_query
 from dependencies.services import get_jira_service
 
 router = APIRouter(prefix="/api", tags=["tickets"])
@@ -17,13 +24,16 @@ router = APIRouter(prefix="/api", tags=["tickets"])
 
 @router.get("/tickets")
 async def list_tickets(
+    request: Request,
+    response: Response,
     q: Optional[str] = None,
     organization_id: Optional[str] = None,
     channel: Optional[str] = None,
     status: str = "all",
     limit: int = 20,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
 ) -> list[dict]:
     query = (
         db.query(JiraTicket, TicketLink, User, Organization, ChannelSession)
@@ -42,26 +52,44 @@ async def list_tickets(
         query = query.filter(
             or_(
                 JiraTicket.ticket_key.ilike(like),
-                JiraTicket.summary.ilike(like),
+                JiraTicket.search_vector.op("@@")(ts_query(q)),
                 User.email.ilike(like),
             )
         )
 
+    if status == "open":
+        query = query.filter(JiraTicket.status_category.in_(OPEN_STATUS_CATEGORIES))
+    elif status == "closed":
+        query = query.filter(JiraTicket.status_category == DONE_STATUS_CATEGORY)
+    if cursor:
+        after_created, after_id = decode_cursor(cursor, datetime, uuid.UUID)
+        query = query.filter(_after_ticket(after_created, after_id))
+
+    # One aggregate over the filtered set, joins included, so a 304 skips the
+    # page query. last_synced_at only moves when the sync changes a row.
+    version = query.with_entities(
+        func.count(JiraTicket.id),
+        func.max(JiraTicket.last_synced_at),
+        func.max(JiraTicket.last_event_at),
+        func.max(func.coalesce(TicketLink.updated_at, TicketLink.created_at)),
+        func.max(func.coalesce(User.updated_at, User.created_at)),
+        func.max(func.coalesce(Organization.updated_at, Organization.created_at)),
+    ).one()
+    cached = conditional_response(request, response, "tickets", etag_for(request, *version))
+    if cached:
+        return cached
+
+    if not cursor:
+        query = query.offset(offset)
     rows = (
-        query.order_by(desc(JiraTicket.created_at))
+        query.order_by(JiraTicket.created_at.desc().nulls_last(), JiraTicket.id.desc())
         .limit(limit)
-        .offset(offset)
         .all()
     )
+    set_next_cursor(response, rows, limit, lambda row: (row[0].created_at, row[0].id))
 
     results = []
     for ticket, link, user, org, session in rows:
-        issue_status = (ticket.status or "").lower()
-        if status == "open" and "done" in issue_status:
-            continue
-        if status == "closed" and "done" not in issue_status:
-            continue
-
         customer_name = None
         if user and user.email:
             customer_name = user.email
@@ -73,6 +101,7 @@ async def list_tickets(
                 "ticket_key": ticket.ticket_key,
                 "summary": ticket.summary,
                 "status": ticket.status,
+                "status_category": ticket.status_category,
                 "priority": ticket.priority,
                 "channel": link.platform if link else "portal",
                 "user": {"email": user.email, "jsm_account_id": user.jsm_account_id} if user else None,
@@ -100,7 +129,7 @@ async def list_tickets(
 @router.get("/tickets/{ticket_key}")
 async def get_ticket(
     ticket_key: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     jira_service: JiraService = Depends(get_jira_service),
 ) -> dict:
     link = db.query(TicketLink).filter(TicketLink.ticket_key == ticket_key).first()
@@ -134,9 +163,13 @@ async def get_ticket(
 @router.get("/tickets/{ticket_key}/messages")
 def list_ticket_messages(
     ticket_key: str,
+    request: Request,
+    response: Response,
     limit: int = 50,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    mark_read: bool = False,
+    db: Session = Depends(get_read_db),
 ) -> list[dict]:
     link = db.query(TicketLink).filter(TicketLink.ticket_key == ticket_key).first()
     if not link:
@@ -146,18 +179,24 @@ def list_ticket_messages(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    messages = (
-        db.query(Message)
-        .filter(Message.session_id == session.id)
-        .order_by(desc(Message.created_at), desc(Message.id))
-        .limit(limit)
-        .offset(offset)
-        .all()
+    if mark_read:
+        read_mark_writer.mark(session.id, datetime.now(timezone.utc))
+
+    message_service = MessageService()
+    count, newest = message_service.get_messages_version(db, session.id)
+    cached = conditional_response(
+        request,
+        response,
+        "ticket_messages",
+        etag_for(request, count, newest),
+        newest,
     )
+    if cached:
+        return cached
 
-    session.last_read_at = datetime.now(timezone.utc)
-    db.add(session)
-    db.commit()
+    before = decode_cursor(cursor, datetime, uuid.UUID) if cursor else None
+    messages = message_service.get_messages_page(db, session.id, limit, offset, before)
+    set_next_cursor(response, messages, limit, lambda message: (message.created_at, message.id))
 
     return [
         {
@@ -171,6 +210,19 @@ def list_ticket_messages(
     ]
 
 
+@router.post("/tickets/{ticket_key}/read", status_code=202)
+def mark_ticket_read(
+    ticket_key: str,
+    db: Session = Depends(get_db),
+) -> dict:
+    link = db.query(TicketLink).filter(TicketLink.ticket_key == ticket_key).first()
+    if not link:
+        raise HTTPException(status_code=404, detail="Ticket not linked")
+
+    read_mark_writer.mark(link.session_id, datetime.now(timezone.utc))
+    return {"status": "accepted"}
+
+
 @router.post("/tickets/{ticket_key}/comment")
 async def add_ticket_comment(
     ticket_key: str,
@@ -182,3 +234,13 @@ async def add_ticket_comment(
         raise HTTPException(status_code=400, detail="Comment text is required")
     await jira_service.add_comment(ticket_key, body.text)
     return {"status": "ok"}
+
+
+def _after_ticket(created_at: Optional[datetime], ticket_id: uuid.UUID):
+    # Keyset predicate for ORDER BY created_at DESC NULLS LAST, id DESC.
+    if created_at is None:
+        return and_(JiraTicket.created_at.is_(None), JiraTicket.id < ticket_id)
+    return or_(
+        tuple_(JiraTicket.created_at, JiraTicket.id) < tuple_(created_at, ticket_id),
+        JiraTicket.created_at.is_(None),
+    )
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+
+from core.prometheus import render
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    body, content_type = render()
+    return Response(content=body, headers={"Content-Type": content_type})
@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends
+import asyncio
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import desc
 from sqlalchemy.orm import Session
 
-from core.database import get_db
+from core.database import get_db, get_read_db
+from core.scheduler import advisory_lock, claim_run
+from models.models import SyncRun
 from dependencies.services import get_jira_service
 from services.jira_service import JiraService
-from services.jira_sync_service import JiraSyncService
+from services.jira_sync_service import ORG_USER_SYNC_JOB, TICKET_SYNC_JOB, JiraSyncService
 
 router = APIRouter(prefix="/api/sync", tags=["sync"])
 
@@ -15,15 +22,71 @@ async def sync_jsm(
     jira_service: JiraService = Depends(get_jira_service),
 ) -> dict:
     sync_service = JiraSyncService(jira_service)
-    result = await sync_service.sync_jira_organizations_and_users(db)
+    async with advisory_lock(ORG_USER_SYNC_JOB) as acquired:
+        if not acquired:
+            raise HTTPException(status_code=409, detail="JSM sync already running")
+        # Counts as a run, so the scheduled job waits a full interval.
+        await asyncio.to_thread(claim_run, ORG_USER_SYNC_JOB)
+        result = await sync_service.sync_jira_organizations_and_users(db)
     return {"status": "ok", "result": result}
 
 
 @router.post("/tickets")
 async def sync_tickets(
+    full: bool = False,
     db: Session = Depends(get_db),
     jira_service: JiraService = Depends(get_jira_service),
 ) -> dict:
     sync_service = JiraSyncService(jira_service)
-    result = await sync_service.sync_jira_tickets(db)
+    async with advisory_lock(TICKET_SYNC_JOB) as acquired:
+        if not acquired:
+            raise HTTPException(status_code=409, detail="Ticket sync already running")
+        await asyncio.to_thread(claim_run, TICKET_SYNC_JOB)
+        result = await sync_service.sync_jira_tickets(db, full=full)
     return {"status": "ok", "result": result}
+
+
+@router.get("/runs")
+def list_sync_runs(
+    kind: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = 20,
+    db: Session = Depends(get_read_db),
+) -> list[dict]:
+    query = db.query(SyncRun)
+    if kind:
+        query = query.filter(SyncRun.kind == kind)
+    if status:
+        query = query.filter(SyncRun.status == status)
+    runs = query.order_by(desc(SyncRun.started_at)).limit(min(limit, 200)).all()
+    return [_serialize_run(run) for run in runs]
+
+
+@router.get("/runs/{run_id}")
+def get_sync_run(
+    run_id: uuid.UUID,
+    db: Session = Depends(get_read_db),
+) -> dict:
+    run = db.get(SyncRun, run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Sync run not found")
+    result = _serialize_run(run)
+    result["summary"] = run.summary
+    result["error"] = run.error
+    return result
+
+
+def _serialize_run(run: SyncRun) -> dict:
+    duration_s = None
+    if run.finished_at and run.started_at:
+        duration_s = round((run.finished_at - run.started_at).total_seconds(), 3)
+    return {
+        "run_id": str(run.id),
+        "kind": run.kind,
+        "status": run.status,
+        "stage": run.stage,
+        "started_at": run.started_at,
+        "finished_at": run.finished_at,
+        "duration_s": duration_s,
+        "stages": run.stages or {},
+    }
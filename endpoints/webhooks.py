@@ -14,10 +14,13 @@ from sqlalchemy.orm import Session
 from adapters.registry import ADAPTERS, send_reply
 from core.config import settings
 from core.database import get_db
+from core.prometheus import WEBHOOK_DURATION, WEBHOOKS_IN_FLIGHT, child, observe
 from models.models import ChannelSession, TicketLink
 from schemas.message import IncomingMessage
 from services.message_service import MessageService
-from dependencies.services import get_webhook_service
+from dependencies.services import get_jira_service, get_webhook_service
+from services.jira_service import JiraService
+from services.jira_sync_service import JiraSyncService
 from services.webhook_service import WebhookService
 
 router = APIRouter()
@@ -25,12 +28,20 @@ logger = logging.getLogger(__name__)
 
 _rate_limit_store: Dict[str, Deque[float]] = {}
 
+_ISSUE_EVENTS = {"jira:issue_created", "jira:issue_updated", "jira:issue_deleted"}
+
 
 @router.post("/webhook/jira")
 async def jira_webhook(
     request: Request,
     db: Session = Depends(get_db),
+    jira_service: JiraService = Depends(get_jira_service),
 ):
+    with observe(WEBHOOK_DURATION, "jira", in_flight=child(WEBHOOKS_IN_FLIGHT, "jira")):
+        return await _handle_jira_webhook(request, db, jira_service)
+
+
+async def _handle_jira_webhook(request: Request, db: Session, jira_service: JiraService):
     body = await request.body()
     logger.info(
         "Jira webhook received",
@@ -54,7 +65,17 @@ async def jira_webhook(
         )
         raise HTTPException(status_code=400, detail="Invalid JSON payload")
 
-    if payload.get("webhookEvent") != "comment_created":
+    event = payload.get("webhookEvent")
+    if event in _ISSUE_EVENTS:
+        issue = payload.get("issue") or {}
+        result = JiraSyncService(jira_service).apply_issue_event(db, payload)
+        logger.info(
+            "Jira webhook issue event applied",
+            extra={"event": event, "ticket_key": issue.get("key"), "result": result},
+        )
+        return {"status": "ok"}
+
+    if event != "comment_created":
         logger.info(
             "Jira webhook ignored event",
             extra={"event": payload.get("webhookEvent")},
@@ -85,6 +106,17 @@ async def webhook(
     adapter = ADAPTERS.get(platform)
     if not adapter:
         raise HTTPException(status_code=400, detail="Unsupported platform")
+    with observe(WEBHOOK_DURATION, platform, in_flight=child(WEBHOOKS_IN_FLIGHT, platform)):
+        return await _handle_platform_webhook(platform, adapter, request, db, webhook_service)
+
+
+async def _handle_platform_webhook(
+    platform: str,
+    adapter,
+    request: Request,
+    db: Session,
+    webhook_service: WebhookService,
+):
     body = await request.body()
     try:
         _verify_signature(platform, request, body)
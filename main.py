@@ -9,17 +9,34 @@ from endpoints.dashboard.conversations import router as conversations_router
 from endpoints.dashboard.tickets import router as tickets_router
 from endpoints.dashboard.organizations import router as organizations_router
 from endpoints.dashboard.stats import router as stats_router
+from endpoints.dashboard.search import router as search_router
+from endpoints.dashboard.stream import router as stream_router
 from endpoints.broadcast import router as broadcast_router
 from endpoints.sync import router as sync_router
+from endpoints.metrics import router as metrics_router
 from core.http_client import init_async_client, close_async_client
 from core.config import settings
-from core.logging import setup_logging, set_trace_context, clear_trace_context
+from core.logging import setup_logging, set_trace_context, clear_trace_context, pop_trace_context, push_trace_context
 from core.database import SessionLocal
+from core.pubsub import notification_hub
+from core import query_stats
+from core.tracing import exports_spans, head_sample, header_span_id, new_trace_id, shutdown_tracing, start_span
+from core.prometheus import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT, child, mark_process_dead
+from core.http_cache import CompressionMiddleware, record_response
+from core.scheduler import Job, Scheduler
 from services.jira_service import JiraService
-from services.jira_sync_service import JiraSyncService
+from services.jira_sync_service import ORG_USER_SYNC_JOB, TICKET_SYNC_JOB, JiraSyncService
+from services.message_partition_service import MessagePartitionService
+from services.metrics_service import MetricsService
+from services.read_mark_service import read_mark_writer
 
 load_dotenv()
-setup_logging(settings.log_level, settings.gcp_project_id)
+setup_logging(
+    settings.log_level,
+    settings.gcp_project_id,
+    sample_rate=settings.log_sample_rate,
+    rate_limit_per_minute=settings.log_rate_limit_per_minute,
+)
 app = FastAPI()
 
 app.include_router(webhook_router)
@@ -28,27 +45,53 @@ app.include_router(conversations_router)
 app.include_router(tickets_router)
 app.include_router(organizations_router)
 app.include_router(stats_router)
+app.include_router(search_router)
+app.include_router(stream_router)
 app.include_router(sync_router)
 app.include_router(broadcast_router)
+app.include_router(metrics_router)
 
 http_logger = logging.getLogger("http.request")
-sync_task: asyncio.Task | None = None
+scheduler = Scheduler()
 
-async def _run_periodic_sync() -> None:
-    while True:
-        await asyncio.sleep(60 * 60 * 24)
+async def _sync_jsm_job() -> None:
+    db = SessionLocal()
+    try:
+        await JiraSyncService(JiraService()).sync_jira_organizations_and_users(db)
+    finally:
+        db.close()
+
+async def _sync_tickets_job() -> None:
+    db = SessionLocal()
+    try:
+        await JiraSyncService(JiraService()).sync_jira_tickets(db)
+    finally:
+        db.close()
+
+async def _metrics_rollup_job() -> None:
+    def refresh() -> None:
+        db = SessionLocal()
         try:
-            db = SessionLocal()
-            sync_service = JiraSyncService(JiraService())
-            await sync_service.sync_jira_organizations_and_users(db)
-            await sync_service.sync_jira_tickets(db)
-        except Exception:
-            logging.getLogger(__name__).exception("JSM periodic sync failed")
+            MetricsService().refresh(db)
         finally:
-            try:
-                db.close()
-            except Exception:
-                pass
+            db.close()
+
+    await asyncio.to_thread(refresh)
+
+async def _message_partitions_job() -> None:
+    def maintain() -> None:
+        db = SessionLocal()
+        try:
+            MessagePartitionService().maintain(
+                db,
+                months_ahead=settings.message_partition_premake_months,
+                retention_months=settings.message_retention_months,
+                archive_dir=settings.message_archive_dir,
+            )
+        finally:
+            db.close()
+
+    await asyncio.to_thread(maintain)
 
 @app.middleware("http")
 async def trace_context_middleware(request: Request, call_next):
@@ -72,13 +115,34 @@ async def trace_context_middleware(request: Request, call_next):
             span_id = None
             sampled = None
 
-    set_trace_context(trace_id, span_id, sampled)
+    # Every request gets a trace id so its log lines group together; spans
+    # are recorded only when the trace is head-sampled. Only upstream or
+    # exported trace ids are linked to Cloud Trace from the logs.
+    sampled = head_sample(sampled)
+    linked = trace_id is not None or (sampled and exports_spans())
+    trace_id = trace_id or new_trace_id()
+    set_trace_context(trace_id, header_span_id(span_id), sampled, linked)
+    request_span = start_span(f"{request.method} {request.url.path}", "server")
+    span_tokens = push_trace_context(trace_id, request_span.span_id, True) if request_span else None
+    HTTP_REQUESTS_IN_FLIGHT.inc()
+    stats_token = query_stats.start_request()
     start = time.perf_counter()
     try:
         response = await call_next(request)
         return response
     finally:
         duration = time.perf_counter() - start
+        HTTP_REQUESTS_IN_FLIGHT.dec()
+        # Route templates keep label cardinality bounded; unmatched paths share one.
+        route = getattr(request.scope.get("route"), "path", None) or "unmatched"
+        status = str(response.status_code) if "response" in locals() else "500"
+        child(HTTP_REQUEST_DURATION, request.method, route, status).observe(duration)
+        stats = query_stats.finish_request(stats_token)
+        if request_span is not None:
+            request_span.name = f"{request.method} {route}"
+            request_span.set_attribute("http.status_code", int(status))
+            request_span.finish()
+            pop_trace_context(span_tokens)
         request_size = request.headers.get("content-length")
         response_size = None
         try:
@@ -99,35 +163,73 @@ async def trace_context_middleware(request: Request, call_next):
             http_request["requestSize"] = request_size
         if response_size:
             http_request["responseSize"] = response_size
-        http_logger.info("HTTP request", extra={"httpRequest": http_request})
+        if "response" in locals():
+            record_response(request, response, int(response_size) if response_size else None)
+        db_extra = {}
+        if stats is not None:
+            db_extra = {"db_queries": stats.count, "db_time_ms": round(stats.total_seconds * 1000, 1)}
+            query_stats.log_request_queries(stats, route)
+        http_logger.info("HTTP request", extra={"httpRequest": http_request, **db_extra})
         clear_trace_context()
 
+# Added after the trace middleware so it wraps it: logged sizes stay uncompressed.
+app.add_middleware(CompressionMiddleware, minimum_size=1000, exclude_paths=("/api/stream",))
+
 @app.on_event("startup")
 async def startup() -> None:
     settings.validate_runtime()
     init_async_client()
-    try:
-        db = SessionLocal()
-        sync_service = JiraSyncService(JiraService())
-        await sync_service.sync_jira_organizations_and_users(db)
-        await sync_service.sync_jira_tickets(db)
-    except Exception:
-        logging.getLogger(__name__).exception("JSM sync on startup failed")
-    finally:
-        try:
-            db.close()
-        except Exception:
-            pass
-    global sync_task
-    sync_task = asyncio.create_task(_run_periodic_sync())
+    await notification_hub.start()
+    read_mark_writer.start()
+    if not settings.scheduler_enabled:
+        return
+    # Jobs start in the background so startup does not wait on Jira.
+    scheduler.add_job(
+        Job(
+            name=ORG_USER_SYNC_JOB,
+            func=_sync_jsm_job,
+            interval_seconds=settings.jira_sync_interval_seconds,
+            jitter_seconds=settings.scheduler_jitter_seconds,
+            initial_delay_seconds=settings.scheduler_start_delay_seconds,
+        )
+    )
+    scheduler.add_job(
+        Job(
+            name=TICKET_SYNC_JOB,
+            func=_sync_tickets_job,
+            interval_seconds=settings.jira_ticket_sync_interval_seconds,
+            jitter_seconds=settings.scheduler_jitter_seconds,
+            initial_delay_seconds=settings.scheduler_start_delay_seconds,
+        )
+    )
+    scheduler.add_job(
+        Job(
+            name="metrics_rollup",
+            func=_metrics_rollup_job,
+            interval_seconds=settings.metrics_rollup_interval_seconds,
+            jitter_seconds=min(settings.scheduler_jitter_seconds, 30),
+            initial_delay_seconds=settings.scheduler_start_delay_seconds,
+        )
+    )
+    scheduler.add_job(
+        Job(
+            name="message_partitions",
+            func=_message_partitions_job,
+            interval_seconds=settings.message_partition_interval_seconds,
+            jitter_seconds=settings.scheduler_jitter_seconds,
+            initial_delay_seconds=settings.scheduler_start_delay_seconds,
+        )
+    )
+    scheduler.start()
 
 @app.on_event("shutdown")
 async def shutdown() -> None:
-    global sync_task
-    if sync_task:
-        sync_task.cancel()
-        sync_task = None
+    await scheduler.stop()
+    await notification_hub.stop()
+    await read_mark_writer.stop()
     await close_async_client()
+    shutdown_tracing()
+    mark_process_dead()
 
 @app.get("/healthz")
 def root():
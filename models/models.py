@@ -1,8 +1,8 @@
 import enum
 import uuid
-from sqlalchemy import Column, String, Boolean, DateTime, Text, ForeignKey, UniqueConstraint, Integer
-from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Boolean, DateTime, Text, ForeignKey, UniqueConstraint, Integer, BigInteger, Table, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from core.database import Base
 
@@ -17,6 +17,9 @@ class AuthStatus(str, enum.Enum):
 
 class Organization(Base):
     __tablename__ = "organizations"
+    __table_args__ = (
+        Index("ix_organizations_name", "name", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     jsm_id = Column(String, unique=True, nullable=False, index=True)
@@ -29,12 +32,19 @@ class Organization(Base):
         nullable=False,
     )
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Maintained by OrganizationService.refresh_counters.
+    user_count = Column(Integer, nullable=False, default=0, server_default="0")
+    conversation_count = Column(Integer, nullable=False, default=0, server_default="0")
+    ticket_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     users = relationship("User", back_populates="organization")
 
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_organization_email", "organization_id", "email"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     jsm_account_id = Column(String, unique=True, nullable=False, index=True)
@@ -70,6 +80,7 @@ class ChannelSession(Base):
         UUID(as_uuid=True),
         ForeignKey("users.id"),
         nullable=True,
+        index=True,
     )
     status = Column(
         String,
@@ -91,6 +102,11 @@ class ChannelSession(Base):
     last_read_at = Column(DateTime(timezone=True))
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     draft_ticket = Column(JSONB, nullable=True)
+    # Denormalized by MessageService so conversation lists avoid scanning messages.
+    last_message_text = Column(Text, nullable=True)
+    last_message_role = Column(String, nullable=True)
+    last_message_at = Column(DateTime(timezone=True), nullable=True)
+    unread_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     user = relationship("User", back_populates="channel_sessions")
     messages = relationship(
@@ -101,13 +117,10 @@ class ChannelSession(Base):
 
 class Message(Base):
     __tablename__ = "messages"
-    __table_args__ = (
-        UniqueConstraint(
-            "session_id",
-            "external_message_id",
-            name="uq_session_external_message_id",
-        ),
-    )
+    # Range-partitioned by month on created_at. Partitions, and the unique
+    # (session_id, external_message_id) index on each of them, are created by
+    # MessagePartitionService; MessageDedupe holds the same key globally.
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     session_id = Column(
@@ -119,15 +132,44 @@ class Message(Base):
     external_message_id = Column(String, nullable=True)
     role = Column(String, nullable=False)
     content = Column(Text, nullable=False)
+    # Part of the primary key because it is the partition key; fetched back
+    # with RETURNING on insert.
     created_at = Column(
         DateTime(timezone=True),
-        server_default=func.now(),
+        primary_key=True,
+        server_default=func.clock_timestamp(),
         nullable=False,
     )
+    # English stemming plus "simple" tokens so Indonesian words still match.
+    # Set from content by the messages_search_vector trigger. Deferred: only
+    # search filters on it, and entity loads should not fetch it.
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
 
     channel_session = relationship("ChannelSession", back_populates="messages")
 
 
+class MessageDedupe(Base):
+    """
+    Global (session_id, external_message_id) key for inbound messages. The
+    unique index on each messages partition cannot catch a redelivery that
+    lands in a later month, so this small unpartitioned table is written in
+    the same savepoint as the message. Rows outlive archived partitions.
+    """
+    __tablename__ = "message_dedupe"
+
+    session_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("channel_sessions.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    external_message_id = Column(String, primary_key=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+
 class TicketLink(Base):
     __tablename__ = "ticket_links"
 
@@ -165,17 +207,131 @@ class JiraTicket(Base):
     summary = Column(Text, nullable=True)
     description = Column(Text, nullable=True)
     status = Column(String, nullable=True)
+    # Jira statusCategory key: "new", "indeterminate" or "done".
+    status_category = Column(String, nullable=False, server_default="indeterminate")
     priority = Column(String, nullable=True)
     assignee = Column(String, nullable=True)
     reporter_name = Column(String, nullable=True)
     reporter_email = Column(String, nullable=True)
-    created_at = Column(String, nullable=True)
-    updated_at = Column(String, nullable=True)
+    # Jira's own created/updated times, not row bookkeeping.
+    created_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
     last_synced_at = Column(
         DateTime(timezone=True),
         server_default=func.now(),
         nullable=False,
     )
+    last_event_at = Column(DateTime(timezone=True), nullable=True)
+    # Weighted summary (A) and description (B); set by the
+    # jira_tickets_search_vector trigger.
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+
+class JiraTicketTombstone(Base):
+    """
+    Issues deleted in Jira, with the time of the deletion event, so late
+    issue_updated deliveries do not recreate them.
+    """
+    __tablename__ = "jira_ticket_tombstones"
+
+    ticket_key = Column(String, primary_key=True)
+    deleted_at = Column(DateTime(timezone=True), nullable=False)
+
+class JiraSyncWatermark(Base):
+    __tablename__ = "jira_sync_watermarks"
+
+    project_key = Column(String, primary_key=True)
+    last_updated_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+class SchedulerJobRun(Base):
+    """Last start of each exclusive scheduler job, shared by all replicas."""
+    __tablename__ = "scheduler_job_runs"
+
+    job_name = Column(String, primary_key=True)
+    last_started_at = Column(DateTime(timezone=True), nullable=False)
+
+class SyncRun(Base):
+    __tablename__ = "sync_runs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String, nullable=False, index=True)
+    status = Column(String, nullable=False, default="running")
+    stage = Column(String, nullable=True)
+    started_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        index=True,
+    )
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    error = Column(Text, nullable=True)
+    stages = Column(JSONB, nullable=True)
+    summary = Column(JSONB, nullable=True)
+
+class MetricHourly(Base):
+    """
+    Hourly rollup of dashboard metrics. Dimensions that do not apply to a
+    metric are stored as '' so they can be part of the primary key.
+    """
+    __tablename__ = "metrics_hourly"
+
+    metric = Column(String, primary_key=True)
+    bucket = Column(DateTime(timezone=True), primary_key=True)
+    platform = Column(String, primary_key=True, server_default="")
+    role = Column(String, primary_key=True, server_default="")
+    organization_id = Column(String, primary_key=True, server_default="")
+    value = Column(BigInteger, nullable=False, server_default="0")
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+class MetricsRollupWatermark(Base):
+    """Every metrics_hourly bucket before rolled_up_until has been computed."""
+    __tablename__ = "metrics_rollup_watermarks"
+
+    name = Column(String, primary_key=True)
+    rolled_up_until = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+# Unlogged staging tables for the JSM org/user sync. Rows are scoped to one
+# sync run and deleted when it ends; they are Core tables, not ORM models.
+jsm_org_stage = Table(
+    "jsm_org_stage",
+    Base.metadata,
+    Column("run_id", UUID(as_uuid=True), nullable=False),
+    Column("batch", Integer, nullable=False),
+    Column("jsm_id", String, nullable=False),
+    Column("jsm_uuid", String, nullable=True),
+    Column("name", String, nullable=True),
+    Index("ix_jsm_org_stage_run_batch", "run_id", "batch"),
+    Index("ix_jsm_org_stage_run_jsm_id", "run_id", "jsm_id"),
+    prefixes=["UNLOGGED"],
+)
+
+jsm_user_stage = Table(
+    "jsm_user_stage",
+    Base.metadata,
+    Column("run_id", UUID(as_uuid=True), nullable=False),
+    Column("batch", Integer, nullable=False),
+    Column("jsm_account_id", String, nullable=False),
+    Column("email", String, nullable=False),
+    Column("org_jsm_id", String, nullable=False),
+    Index("ix_jsm_user_stage_run_batch", "run_id", "batch"),
+    Index("ix_jsm_user_stage_run_account", "run_id", "jsm_account_id"),
+    prefixes=["UNLOGGED"],
+)
 
 class EmailVerification(Base):
     __tablename__ = "email_verifications"
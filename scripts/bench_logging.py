@@ -0,0 +1,116 @@
+"""
+Benchmark log throughput of the JSON logging pipeline.
+
+Compares the previous setup (StreamHandler on the calling thread, with a
+formatter that test-serializes every extra attribute before dumping the
+payload again) against the current one (ContextQueueHandler feeding a
+QueueListener, single-pass orjson encoding). Output goes to os.devnull,
+so the numbers reflect logging overhead rather than terminal speed.
+
+"caller" is what the logging thread (the event loop, in the app) pays
+per record; "drained" includes the listener finishing the backlog.
+
+Usage:
+    python -m scripts.bench_logging --records 50000
+"""
+import argparse
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import time
+import uuid
+from datetime import datetime, timezone
+
+from core.logging import (
+    _BUILTIN_ATTRS,
+    ContextQueueHandler,
+    JsonFormatter,
+    _trace_context,
+    set_trace_context,
+)
+
+
+class LegacyJsonFormatter(logging.Formatter):
+    """The previous JsonFormatter: json.dumps per extra value, then the payload."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "severity": record.levelname,
+            "message": record.getMessage(),
+            "logger": record.name,
+            "time": datetime.now(timezone.utc).isoformat(),
+        }
+        trace_id, span_id, sampled, _ = _trace_context(record)
+        if trace_id:
+            payload["traceId"] = trace_id
+        if span_id:
+            payload["spanId"] = span_id
+        if sampled is not None:
+            payload["trace_sampled"] = sampled
+        for key, value in record.__dict__.items():
+            if key in _BUILTIN_ATTRS:
+                continue
+            try:
+                json.dumps(value)
+            except TypeError:
+                value = str(value)
+            payload[key] = value
+        return json.dumps(payload, ensure_ascii=False)
+
+
+def _extra(index: int) -> dict:
+    return {
+        "session_id": str(uuid.uuid4()),
+        "platform": "telegram",
+        "elapsed_s": 0.123,
+        "attempt": index,
+        "received_at": datetime.now(timezone.utc),
+        "draft": {"summary": "Printer offline", "priority": "P3", "fields": ["a", "b"]},
+    }
+
+
+def _run(label: str, logger: logging.Logger, records: int, drain) -> None:
+    extras = [_extra(index) for index in range(256)]
+    started = time.perf_counter()
+    for index in range(records):
+        logger.info("Webhook handled for %s", "telegram", extra=extras[index % len(extras)])
+    caller = time.perf_counter() - started
+    drain()
+    drained = time.perf_counter() - started
+    print(
+        f"{label:<28} caller {records / caller:>10.0f} rec/s"
+        f"   drained {records / drained:>10.0f} rec/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=50000)
+    args = parser.parse_args()
+
+    set_trace_context("0123456789abcdef0123456789abcdef", "42", True)
+    with open(os.devnull, "w", encoding="utf-8") as sink:
+        legacy = logging.getLogger("bench.legacy")
+        handler = logging.StreamHandler(sink)
+        handler.setFormatter(LegacyJsonFormatter())
+        legacy.addHandler(handler)
+        legacy.propagate = False
+        legacy.setLevel(logging.INFO)
+        _run("stream handler (legacy)", legacy, args.records, handler.flush)
+
+        current = logging.getLogger("bench.queue")
+        stream = logging.StreamHandler(sink)
+        stream.setFormatter(JsonFormatter())
+        records_queue: queue.SimpleQueue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(records_queue, stream, respect_handler_level=True)
+        listener.start()
+        current.addHandler(ContextQueueHandler(records_queue))
+        current.propagate = False
+        current.setLevel(logging.INFO)
+        _run("queue handler + orjson", current, args.records, listener.stop)
+
+
+if __name__ == "__main__":
+    main()
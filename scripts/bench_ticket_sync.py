@@ -0,0 +1,82 @@
+"""
+Benchmark jira_tickets upsert throughput against DATABASE_URL.
+
+Compares one INSERT ... ON CONFLICT per issue with the page-level bulk
+upsert used by JiraSyncService. Everything runs inside a transaction that
+is rolled back, so the target database is left unchanged.
+
+Usage:
+    python -m scripts.bench_ticket_sync --issues 5000 --page-size 100
+"""
+import argparse
+import time
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql import func
+
+from core.database import SessionLocal
+from models.models import JiraTicket
+from services.jira_sync_service import JiraSyncService, _ticket_update_set, _ticket_values
+
+
+def _fake_issues(count: int, prefix: str) -> list[dict]:
+    return [
+        {
+            "key": f"{prefix}-{index}",
+            "fields": {
+                "summary": f"Benchmark issue {index}",
+                "description": "Synthetic issue generated by bench_ticket_sync",
+                "status": {"name": "Open", "statusCategory": {"key": "new"}},
+                "priority": {"name": "P3"},
+                "assignee": {"displayName": "Bench Agent"},
+                "reporter": {"displayName": "Bench User", "emailAddress": "bench@example.com"},
+                "created": "2026-01-01T00:00:00.000+0000",
+                "updated": f"2026-01-01T00:{index % 60:02d}:00.000+0000",
+            },
+        }
+        for index in range(count)
+    ]
+
+
+def _per_row(db, rows: list[dict]) -> None:
+    for values in rows:
+        stmt = insert(JiraTicket).values(**values)
+        update = _ticket_update_set(stmt)
+        update["last_synced_at"] = func.now()
+        db.execute(stmt.on_conflict_do_update(index_elements=["ticket_key"], set_=update))
+
+
+def _run(label: str, db, pages: list[list[dict]], writer) -> None:
+    started = time.perf_counter()
+    for rows in pages:
+        writer(db, rows)
+    db.flush()
+    elapsed = time.perf_counter() - started
+    total = sum(len(rows) for rows in pages)
+    print(f"{label:<24} {total:>7} rows  {elapsed:8.3f}s  {total / elapsed:10.1f} rows/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--issues", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+
+    sync_service = JiraSyncService(jira_service=None)
+    db = SessionLocal()
+    try:
+        for label, prefix, writer in (
+            ("per-row upsert", "BENCHROW", _per_row),
+            ("bulk upsert", "BENCHBULK", sync_service.upsert_ticket_rows),
+            ("bulk upsert (unchanged)", "BENCHBULK", sync_service.upsert_ticket_rows),
+        ):
+            rows = [_ticket_values(issue, "BENCH") for issue in _fake_issues(args.issues, prefix)]
+            pages = [rows[i:i + args.page_size] for i in range(0, len(rows), args.page_size)]
+            _run(label, db, pages, writer)
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
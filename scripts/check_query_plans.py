@@ -0,0 +1,145 @@
+"""
+Check that the hot dashboard and webhook queries use indexes.
+
+Seeds channel sessions and messages into DATABASE_URL, runs ANALYZE, and
+EXPLAINs each query. The script exits non-zero if any plan falls back to
+a sequential scan on messages or channel_sessions. Everything runs
+inside a transaction that is rolled back, so the target database is left
+unchanged.
+
+Usage:
+    python -m scripts.check_query_plans --sessions 2000 --messages-per-session 40
+"""
+import argparse
+import json
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from core.database import SessionLocal
+
+_WATCHED_TABLES = {"messages", "channel_sessions"}
+_PARTITION = re.compile(r"^(messages)_p\d{4}_\d{2}$")
+
+_SEED_SESSIONS = """
+INSERT INTO channel_sessions (
+    id, platform, external_user_id, status, auth_status, created_at, updated_at,
+    last_read_at, unread_count
+)
+SELECT
+    gen_random_uuid(),
+    (ARRAY['whatsapp', 'telegram', 'line'])[1 + n % 3],
+    'plan-check-' || n,
+    CASE WHEN n % 20 = 0 THEN 'active' ELSE 'inactive' END,
+    'anonymous',
+    now() - make_interval(mins => n),
+    CASE WHEN n % 2 = 0 THEN now() - make_interval(secs => n) END,
+    now() - make_interval(mins => n % 30),
+    CASE WHEN n % 25 = 0 THEN 1 ELSE 0 END
+FROM generate_series(1, :sessions) AS n
+"""
+
+_SEED_MESSAGES = """
+INSERT INTO messages (id, session_id, role, content, created_at)
+SELECT
+    gen_random_uuid(),
+    s.id,
+    CASE WHEN m % 2 = 0 THEN 'user' ELSE 'agent' END,
+    'plan check message ' || m,
+    now() - make_interval(mins => m)
+FROM channel_sessions AS s
+CROSS JOIN generate_series(1, :per_session) AS m
+WHERE s.external_user_id LIKE 'plan-check-%'
+"""
+
+# Each entry mirrors a query issued by the application.
+_QUERIES = {
+    "recent messages (MessageService.get_recent_messages)": """
+        SELECT * FROM messages
+        WHERE session_id = :session_id
+        ORDER BY created_at DESC, id DESC
+        LIMIT 8
+    """,
+    "unread user messages since last read": """
+        SELECT count(*) FROM messages
+        WHERE session_id = :session_id AND role = 'user' AND created_at > :since
+    """,
+    "conversation list": """
+        SELECT * FROM channel_sessions
+        ORDER BY coalesce(updated_at, created_at) DESC, id DESC
+        LIMIT 20
+    """,
+    "conversation list by channel": """
+        SELECT * FROM channel_sessions
+        WHERE platform = 'telegram'
+        ORDER BY coalesce(updated_at, created_at) DESC, id DESC
+        LIMIT 20
+    """,
+    "conversation list, unread only": """
+        SELECT * FROM channel_sessions
+        WHERE unread_count > 0
+        ORDER BY coalesce(updated_at, created_at) DESC, id DESC
+        LIMIT 20
+    """,
+    "broadcast targets": """
+        SELECT * FROM channel_sessions
+        WHERE status = 'active' AND platform = 'line'
+    """,
+}
+
+
+def _seq_scans(plan: dict) -> list[str]:
+    found = []
+    relation = plan.get("Relation Name") or ""
+    # Scans of a partition count against its parent table.
+    relation = _PARTITION.sub(r"\1", relation)
+    if plan.get("Node Type") == "Seq Scan" and relation in _WATCHED_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--messages-per-session", type=int, default=40)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    failures = 0
+    try:
+        db.execute(text(_SEED_SESSIONS), {"sessions": args.sessions})
+        db.execute(text(_SEED_MESSAGES), {"per_session": args.messages_per_session})
+        db.execute(text("ANALYZE channel_sessions"))
+        db.execute(text("ANALYZE messages"))
+        session_id = db.execute(
+            text("SELECT id FROM channel_sessions WHERE external_user_id = 'plan-check-1'")
+        ).scalar()
+        params = {
+            "session_id": session_id,
+            "since": datetime.now(timezone.utc) - timedelta(minutes=10),
+        }
+
+        for label, sql in _QUERIES.items():
+            plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), params).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            root = plan[0]["Plan"]
+            scans = _seq_scans(root)
+            status = "FAIL" if scans else "ok"
+            detail = f"seq scan on {', '.join(scans)}" if scans else root["Node Type"]
+            print(f"{status:<5} {label:<55} {detail}")
+            failures += bool(scans)
+    finally:
+        db.rollback()
+        db.close()
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@ from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
 from models.models import ChannelSession, EmailVerification, AuthStatus, User
 from core.config import settings
+from services.metrics_service import MetricsService
+from services.organization_service import OrganizationService
 
 class AuthService:
     TOKEN_EXP_MINUTES = 15
@@ -62,6 +64,7 @@ class AuthService:
 
         user.is_authenticated = True
 
+        previous_user = db.get(User, session.user_id) if session.user_id else None
         session.user_id = user.id
         session.auth_status = AuthStatus.authenticated.value
         session.auth_expires_at = datetime.now(timezone.utc) + timedelta(days=settings.auth_ttl_days)
@@ -69,6 +72,12 @@ class AuthService:
         db.delete(verification)
         db.add(user)
         db.add(session)
+        db.flush()
+        OrganizationService().refresh_counters(
+            db,
+            [user.organization_id, previous_user.organization_id if previous_user else None],
+        )
+        MetricsService().record_verification(db, session.platform, user.organization_id)
 
         return session, None
     
@@ -2,6 +2,7 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from core.config import settings
+from core.tracing import traced
 
 class EmailService:
     def send_verification_email(self, email: str, verify_link: str) -> None:
@@ -26,6 +27,7 @@ class EmailService:
             "Support Team"
         )
 
+    @traced("smtp.send", kind="client")
     def _send_email(self, to_email: str, subject: str, body: str) -> None:
         smtp_host, smtp_port, smtp_username, smtp_password, smtp_from_email = settings.require_smtp()
 
@@ -1,9 +1,12 @@
 import logging
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import httpx
 from core.config import settings
 from core.http_client import get_async_client
+from core.prometheus import JIRA_REQUEST_DURATION, JIRA_REQUESTS_IN_FLIGHT, observe, timed_jira
+from core.tracing import span, traced
 from core.jira_constants import (
     PROJECT_KEY,
     PRIORITY_MAPPING,
@@ -27,6 +30,8 @@ class JiraService:
     def _url(self, path: str) -> str:
         return f"{self.base_url.rstrip('/')}{path}"
 
+    @timed_jira
+    @traced(kind="client")
     async def email_exists(self, email: str) -> bool:
         """
         Check if email exists as JSM customer in a service desk
@@ -73,41 +78,9 @@ class JiraService:
             return False
 
     async def list_organizations(self, limit: int = 50) -> List[Dict[str, Any]]:
-        url = self._url(
-            f"/rest/servicedeskapi/servicedesk/{self.service_desk_id}/organization"
-        )
-        headers = {"Accept": "application/json"}
-        start = 0
         results: List[Dict[str, Any]] = []
-        client = get_async_client()
-
-        while True:
-            params = {"start": start, "limit": limit}
-            try:
-                resp = await client.get(
-                    url,
-                    headers=headers,
-                    auth=self.auth,
-                    params=params,
-                    timeout=15.0,
-                )
-                resp.raise_for_status()
-                data = resp.json()
-            except httpx.HTTPStatusError:
-                logger.exception("Jira list_organizations failed: %s", resp.text)
-                raise RuntimeError("Failed to list Jira organizations")
-            except httpx.RequestError:
-                logger.exception("Jira list_organizations request error")
-                raise RuntimeError("Failed to list Jira organizations")
-
-            values = data.get("values", [])
-            results.extend(values)
-            if data.get("isLastPage") is True:
-                break
-            start = int(data.get("start", start)) + int(data.get("limit", limit))
-            if not values:
-                break
-
+        async for page in self.iter_organization_pages(limit=limit):
+            results.extend(page)
         return results
 
     async def list_organization_users(
@@ -115,41 +88,75 @@ class JiraService:
         organization_id: str,
         limit: int = 50,
     ) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = []
+        async for page in self.iter_organization_user_pages(organization_id, limit=limit):
+            results.extend(page)
+        return results
+
+    def iter_organization_pages(self, limit: int = 50) -> AsyncIterator[List[Dict[str, Any]]]:
+        url = self._url(
+            f"/rest/servicedeskapi/servicedesk/{self.service_desk_id}/organization"
+        )
+        return self._iter_servicedesk_pages(url, limit, "list_organizations", "Failed to list Jira organizations")
+
+    def iter_organization_user_pages(
+        self,
+        organization_id: str,
+        limit: int = 50,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
         url = self._url(f"/rest/servicedeskapi/organization/{organization_id}/user")
+        return self._iter_servicedesk_pages(
+            url,
+            limit,
+            "list_organization_users",
+            "Failed to list Jira organization users",
+        )
+
+    async def _iter_servicedesk_pages(
+        self,
+        url: str,
+        limit: int,
+        operation: str,
+        error_message: str,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
         headers = {"Accept": "application/json"}
         start = 0
-        results: List[Dict[str, Any]] = []
         client = get_async_client()
 
         while True:
             params = {"start": start, "limit": limit}
-            try:
-                resp = await client.get(
-                    url,
-                    headers=headers,
-                    auth=self.auth,
-                    params=params,
-                    timeout=15.0,
-                )
-                resp.raise_for_status()
-                data = resp.json()
-            except httpx.HTTPStatusError:
-                logger.exception("Jira list_organization_users failed: %s", resp.text)
-                raise RuntimeError("Failed to list Jira organization users")
-            except httpx.RequestError:
-                logger.exception("Jira list_organization_users request error")
-                raise RuntimeError("Failed to list Jira organization users")
+            # Paged generators are timed per page, under the public method name.
+            with observe(JIRA_REQUEST_DURATION, operation, in_flight=JIRA_REQUESTS_IN_FLIGHT), span(
+                f"JiraService.{operation}", "client", start=start
+            ):
+                try:
+                    resp = await client.get(
+                        url,
+                        headers=headers,
+                        auth=self.auth,
+                        params=params,
+                        timeout=15.0,
+                    )
+                    resp.raise_for_status()
+                    data = resp.json()
+                except httpx.HTTPStatusError:
+                    logger.exception("Jira %s failed: %s", operation, resp.text)
+                    raise RuntimeError(error_message)
+                except httpx.RequestError:
+                    logger.exception("Jira %s request error", operation)
+                    raise RuntimeError(error_message)
 
             values = data.get("values", [])
-            results.extend(values)
+            if values:
+                yield values
             if data.get("isLastPage") is True:
                 break
             start = int(data.get("start", start)) + int(data.get("limit", limit))
             if not values:
                 break
 
-        return results
-
+    @timed_jira
+    @traced(kind="client")
     async def create_ticket(
         self,
         summary: str,
@@ -200,6 +207,8 @@ class JiraService:
             logger.exception("Jira create_ticket request error")
             raise RuntimeError("Failed to create Jira ticket")
 
+    @timed_jira
+    @traced(kind="client")
     async def get_ticket_detail(self, ticket_key: str) -> Dict[str, Any]:
         url = self._url(f"/rest/api/3/issue/{ticket_key}")
         params = {"fields": "summary,description,status,assignee,priority,reporter,created,updated"}
@@ -238,6 +247,8 @@ class JiraService:
             "updated_at": fields.get("updated"),
         }
 
+    @timed_jira
+    @traced(kind="client")
     async def list_tickets_by_reporter(
         self,
         email: str,
@@ -293,6 +304,8 @@ class JiraService:
             )
         return results
 
+    @timed_jira
+    @traced(kind="client")
     async def get_issues_by_keys(self, ticket_keys: list[str]) -> List[Dict[str, Any]]:
         if not ticket_keys:
             return []
@@ -344,45 +357,103 @@ class JiraService:
             )
         return results
 
-    async def list_all_tickets(
+    def ticket_search_jql(self, project: str = PROJECT_KEY, updated_since: Optional[datetime] = None) -> str:
+        """
+        JQL for project issues ordered by `updated` ascending. Build it once
+        per sync run: the relative cutoff depends on the current time, and a
+        nextPageToken is only valid for the query that produced it.
+        """
+        jql = f"project = {project}"
+        if updated_since is not None:
+            # Relative JQL dates are evaluated server side, so they do not
+            # depend on the timezone configured for the integration user.
+            elapsed = datetime.now(timezone.utc) - updated_since
+            minutes = max(int(elapsed.total_seconds() // 60) + 1, 1)
+            jql += f' AND updated >= "-{minutes}m"'
+        return jql + " ORDER BY updated ASC, key ASC"
+
+    @timed_jira
+    @traced(kind="client")
+    async def search_tickets(
         self,
         project: str = PROJECT_KEY,
-        start_at: int = 0,
-        max_results: int = 50,
+        updated_since: Optional[datetime] = None,
+        next_page_token: Optional[str] = None,
+        max_results: int = 100,
+        jql: Optional[str] = None,
     ) -> Dict[str, Any]:
-        jql = f"project={project} ORDER BY created DESC"
+        """
+        Fetch one page of project issues ordered by `updated` ascending,
+        paged with the /search/jql nextPageToken cursor. Pass the `jql` of
+        the first page when following a nextPageToken.
+        """
+        if jql is None:
+            jql = self.ticket_search_jql(project, updated_since)
+
         url = self._url("/rest/api/3/search/jql")
-        params = {
+        payload: Dict[str, Any] = {
             "jql": jql,
-            "fields": "summary,status,assignee,reporter,created,priority",
-            "startAt": start_at,
+            "fields": [
+                "summary",
+                "description",
+                "status",
+                "assignee",
+                "reporter",
+                "priority",
+                "created",
+                "updated",
+            ],
             "maxResults": max_results,
         }
+        if next_page_token:
+            payload["nextPageToken"] = next_page_token
         client = get_async_client()
         try:
-            resp = await client.get(
+            resp = await client.post(
                 url,
                 headers=self._headers(),
                 auth=self.auth,
-                params=params,
+                json=payload,
                 timeout=30.0,
             )
             resp.raise_for_status()
             data = resp.json()
         except httpx.HTTPStatusError:
-            logger.exception("Jira list_all_tickets failed: %s", resp.text)
+            logger.exception("Jira search_tickets failed: %s", resp.text)
             raise RuntimeError("Failed to list Jira tickets")
         except httpx.RequestError:
-            logger.exception("Jira list_all_tickets request error")
+            logger.exception("Jira search_tickets request error")
             raise RuntimeError("Failed to list Jira tickets")
 
         return {
             "issues": data.get("issues", []),
-            "total": data.get("total", 0),
-            "startAt": data.get("startAt", start_at),
-            "maxResults": data.get("maxResults", max_results),
+            "nextPageToken": data.get("nextPageToken"),
+            "isLast": bool(data.get("isLast", not data.get("nextPageToken"))),
         }
 
+    async def iter_ticket_pages(
+        self,
+        project: str = PROJECT_KEY,
+        updated_since: Optional[datetime] = None,
+        max_results: int = 100,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        jql = self.ticket_search_jql(project, updated_since)
+        next_page_token = None
+        while True:
+            page = await self.search_tickets(
+                next_page_token=next_page_token,
+                max_results=max_results,
+                jql=jql,
+            )
+            issues = page.get("issues", [])
+            if issues:
+                yield issues
+            next_page_token = page.get("nextPageToken")
+            if not issues or page.get("isLast") or not next_page_token:
+                break
+
+    @timed_jira
+    @traced(kind="client")
     async def add_comment(
         self,
         ticket_key: str,
@@ -414,6 +485,8 @@ class JiraService:
             logger.exception("Jira add_comment request error")
             raise RuntimeError("Failed to add Jira comment")
 
+    @timed_jira
+    @traced(kind="client")
     async def get_public_comments(
         self,
         ticket_key: str,
@@ -1,14 +1,91 @@
+import asyncio
+import csv
+import io
 import json
 import logging
-from typing import Any
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Optional, TypeVar
 
+from sqlalchemy import or_, text
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.sql import func
 
-from core.jira_constants import PROJECT_KEY
-from models.models import JiraTicket, Organization, User
+from core.jira_constants import PROJECT_KEY, STATUS_CATEGORIES, STATUS_CATEGORY_BY_NAME
+from models.models import JiraSyncWatermark, JiraTicket, JiraTicketTombstone
 from services.jira_service import JiraService
+from services.organization_service import OrganizationService
+from services.sync_run_service import SyncRunRecorder
+
+T = TypeVar("T")
+
+# Scheduler job names; the manual /api/sync endpoints take the same locks.
+ORG_USER_SYNC_JOB = "jira_org_user_sync"
+TICKET_SYNC_JOB = "jira_ticket_sync"
+
+# Staging rows are keyed by sync run and page ("batch"), so each page can be
+# merged and committed on its own while the run keeps the full set of seen
+# keys for the final anti-join.
+_MERGE_ORGS = """
+INSERT INTO organizations (id, jsm_id, jsm_uuid, name, is_active)
+SELECT gen_random_uuid(), s.jsm_id, s.jsm_uuid, s.name, true
+FROM (
+    SELECT DISTINCT ON (jsm_id) jsm_id, jsm_uuid, name
+    FROM jsm_org_stage
+    WHERE run_id = :run_id AND batch = :batch
+    ORDER BY jsm_id
+) AS s
+ON CONFLICT (jsm_id) DO UPDATE SET
+    jsm_uuid = EXCLUDED.jsm_uuid,
+    name = EXCLUDED.name,
+    is_active = true,
+    updated_at = now()
+WHERE organizations.jsm_uuid IS DISTINCT FROM EXCLUDED.jsm_uuid
+    OR organizations.name IS DISTINCT FROM EXCLUDED.name
+    OR NOT organizations.is_active
+"""
+
+_DEACTIVATE_ORGS = """
+UPDATE organizations AS o
+SET is_active = false, updated_at = now()
+WHERE o.is_active
+    AND NOT EXISTS (
+        SELECT 1 FROM jsm_org_stage AS s
+        WHERE s.run_id = :run_id AND s.jsm_id = o.jsm_id
+    )
+"""
+
+_MERGE_USERS = """
+INSERT INTO users (id, jsm_account_id, email, organization_id, is_active)
+SELECT gen_random_uuid(), s.jsm_account_id, s.email, o.id, true
+FROM (
+    SELECT DISTINCT ON (jsm_account_id) jsm_account_id, email, org_jsm_id
+    FROM jsm_user_stage
+    WHERE run_id = :run_id AND batch = :batch
+    ORDER BY jsm_account_id, org_jsm_id
+) AS s
+JOIN organizations AS o ON o.jsm_id = s.org_jsm_id
+ON CONFLICT (jsm_account_id) DO UPDATE SET
+    email = EXCLUDED.email,
+    organization_id = EXCLUDED.organization_id,
+    is_active = true,
+    updated_at = now()
+WHERE users.email IS DISTINCT FROM EXCLUDED.email
+    OR users.organization_id IS DISTINCT FROM EXCLUDED.organization_id
+    OR NOT users.is_active
+"""
+
+_DEACTIVATE_USERS = """
+UPDATE users AS u
+SET is_active = false, updated_at = now()
+WHERE u.is_active
+    AND NOT EXISTS (
+        SELECT 1 FROM jsm_user_stage AS s
+        WHERE s.run_id = :run_id AND s.jsm_account_id = u.jsm_account_id
+    )
+"""
 
 
 class JiraSyncService:
@@ -17,185 +94,494 @@ class JiraSyncService:
         self.logger = logging.getLogger(__name__)
 
     async def sync_jira_organizations_and_users(self, db: Session) -> dict[str, Any]:
+        """
+        Sync JSM organizations and their users as a streaming pipeline.
+
+        Each fetched page is COPY'd into a staging table, merged with a
+        set-based INSERT ... SELECT ... ON CONFLICT and committed while the
+        next page is already being fetched. Once every page has been seen,
+        rows missing from this run's staging set are deactivated with an
+        anti-join. Memory and transaction size stay bounded by one page.
+        """
         self.logger.info("JSM sync started")
+        run = SyncRunRecorder("jsm_org_users").start()
+        try:
+            summary = await self._sync_organizations_and_users(db, run)
+        except Exception as exc:
+            db.rollback()
+            run.fail(exc)
+            raise
+        finally:
+            await asyncio.to_thread(_clear_stage, db, run.run_id)
+        summary["run_id"] = str(run.run_id)
+        run.finish(summary)
+        self.logger.info("JSM sync completed", extra=summary)
+        return summary
 
-        # Step 1: Fetch organizations from JSM.
-        organizations = await self.jira_service.list_organizations()
-        self.logger.info("JSM organizations fetched", extra={"count": len(organizations)})
-
-        # Step 2: Upsert organizations by jsm_id.
-        org_jsm_ids: set[str] = set()
-        for org in organizations:
-            jsm_id = str(org.get("id") or "").strip()
-            if not jsm_id:
-                continue
-            jsm_uuid = org.get("uuid")
-            name = org.get("name") or "-"
-            org_jsm_ids.add(jsm_id)
-
-            stmt = insert(Organization).values(
-                jsm_id=jsm_id,
-                jsm_uuid=jsm_uuid,
-                name=name,
-                is_active=True,
-            )
-            update = {
-                "jsm_uuid": stmt.excluded.jsm_uuid,
-                "name": stmt.excluded.name,
-                "is_active": True,
-                "updated_at": func.now(),
-            }
-            db.execute(stmt.on_conflict_do_update(index_elements=["jsm_id"], set_=update))
-
-        # Step 3: Deactivate organizations no longer in JSM.
-        if org_jsm_ids:
-            db.query(Organization).filter(~Organization.jsm_id.in_(org_jsm_ids)).update(
-                {"is_active": False, "updated_at": func.now()},
-                synchronize_session=False,
-            )
-        else:
-            db.query(Organization).update(
-                {"is_active": False, "updated_at": func.now()},
-                synchronize_session=False,
+    async def _sync_organizations_and_users(self, db: Session, run: SyncRunRecorder) -> dict[str, Any]:
+        run_id = run.run_id
+        batch = 0
+
+        # Step 1: Stream organizations from JSM, upserting them by jsm_id.
+        org_jsm_ids: dict[str, None] = {}
+        organizations_seen = 0
+        async for page in _stream_pages(run, self.jira_service.iter_organization_pages()):
+            organizations_seen += len(page)
+            org_rows = []
+            for org in page:
+                jsm_id = str(org.get("id") or "").strip()
+                if not jsm_id:
+                    continue
+                org_jsm_ids[jsm_id] = None
+                org_rows.append((run_id, batch, jsm_id, org.get("uuid"), org.get("name") or "-"))
+            with run.stage("upsert"):
+                run.add_rows(
+                    "upsert",
+                    await asyncio.to_thread(
+                        _merge_page,
+                        db,
+                        "jsm_org_stage",
+                        ("run_id", "batch", "jsm_id", "jsm_uuid", "name"),
+                        org_rows,
+                        _MERGE_ORGS,
+                        {"run_id": str(run_id), "batch": batch},
+                    ),
+                )
+            batch += 1
+        self.logger.info("JSM organizations fetched", extra={"count": organizations_seen})
+
+        # Step 2: Stream users for each organization, upserting them by jsm_account_id.
+        for jsm_id in org_jsm_ids:
+            members_seen = 0
+            async for page in _stream_pages(run, self.jira_service.iter_organization_user_pages(jsm_id)):
+                members_seen += len(page)
+                user_rows = []
+                for member in page:
+                    account_id = (member.get("accountId") or "").strip()
+                    email = (member.get("emailAddress") or "").strip().lower()
+                    if not account_id or not email:
+                        continue
+                    user_rows.append((run_id, batch, account_id, email, jsm_id))
+                with run.stage("upsert"):
+                    run.add_rows(
+                        "upsert",
+                        await asyncio.to_thread(
+                            _merge_page,
+                            db,
+                            "jsm_user_stage",
+                            ("run_id", "batch", "jsm_account_id", "email", "org_jsm_id"),
+                            user_rows,
+                            _MERGE_USERS,
+                            {"run_id": str(run_id), "batch": batch},
+                        ),
+                    )
+                batch += 1
+            self.logger.info(
+                "JSM organization users fetched",
+                extra={"org_id": jsm_id, "count": members_seen},
             )
 
-        db.flush()
+        # Step 3: Deactivate organizations and users no longer in JSM.
+        with run.stage("deactivate"):
+            deactivated, users_active = await asyncio.to_thread(_deactivate_missing, db, run_id)
+            run.add_rows("deactivate", deactivated)
 
-        org_rows = db.query(Organization.id, Organization.jsm_id).all()
-        org_id_map = {row.jsm_id: row.id for row in org_rows if row.jsm_id}
+        return {
+            "organizations_seen": organizations_seen,
+            "organizations_active": len(org_jsm_ids),
+            "users_active": users_active,
+        }
 
-        # Step 4: Fetch and upsert users for each organization.
-        user_account_ids: set[str] = set()
-        for org in organizations:
-            jsm_id = str(org.get("id") or "").strip()
-            if not jsm_id:
-                continue
-            org_id = org_id_map.get(jsm_id)
-            if not org_id:
-                continue
+    async def sync_jira_tickets(
+        self,
+        db: Session,
+        project_key: str = PROJECT_KEY,
+        full: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Sync project issues into jira_tickets.
 
-            members = await self.jira_service.list_organization_users(jsm_id)
-            self.logger.info(
-                "JSM organization users fetched",
-                extra={"org_id": jsm_id, "count": len(members)},
+        Incremental by default: only issues updated since the stored
+        watermark are fetched, oldest first. The watermark advances after
+        each page commits, so an interrupted run resumes where it stopped.
+        `full=True` ignores the watermark and rescans the whole project.
+        """
+        watermark = None if full else self._get_watermark(db, project_key)
+        mode = "incremental" if watermark else "full"
+        self.logger.info(
+            "Jira ticket sync started",
+            extra={
+                "project_key": project_key,
+                "mode": mode,
+                "watermark": watermark.isoformat() if watermark else None,
+            },
+        )
+        run = SyncRunRecorder("jira_tickets").start()
+        try:
+            summary = await self._sync_tickets(db, run, project_key, watermark)
+        except Exception as exc:
+            db.rollback()
+            run.fail(exc)
+            raise
+        summary["mode"] = mode
+        summary["run_id"] = str(run.run_id)
+        run.finish(summary)
+        self.logger.info("Jira ticket sync completed", extra=summary)
+        return summary
+
+    async def _sync_tickets(
+        self,
+        db: Session,
+        run: SyncRunRecorder,
+        project_key: str,
+        watermark: Optional[datetime],
+    ) -> dict[str, Any]:
+        total_seen = 0
+        total_written = 0
+        started = time.perf_counter()
+        pages = self.jira_service.iter_ticket_pages(
+            project=project_key,
+            updated_since=watermark,
+            max_results=100,
+        )
+        async for issues in _stream_pages(run, pages):
+            with run.stage("upsert"):
+                written = await asyncio.to_thread(self._write_ticket_page, db, project_key, issues)
+                run.add_rows("upsert", written)
+            total_seen += len(issues)
+            total_written += written
+
+        elapsed = time.perf_counter() - started
+        return {
+            "tickets_seen": total_seen,
+            "tickets_written": total_written,
+            "project_key": project_key,
+            "elapsed_s": round(elapsed, 3),
+            "rows_per_second": round(total_seen / elapsed, 1) if elapsed > 0 else None,
+        }
+
+    def _write_ticket_page(self, db: Session, project_key: str, issues: list[dict[str, Any]]) -> int:
+        rows = [
+            values
+            for values in (_ticket_values(issue, project_key) for issue in issues)
+            if values
+        ]
+        written = self.upsert_ticket_rows(db, self._drop_deleted(db, rows))
+        page_updated_at = max(
+            filter(None, (row.get("updated_at") for row in rows)),
+            default=None,
+        )
+        if page_updated_at:
+            self._advance_watermark(db, project_key, page_updated_at)
+        db.commit()
+        return written
+
+    def _drop_deleted(self, db: Session, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        # A search page fetched just before a deletion webhook can still list
+        # the issue; the tombstone wins unless the row is newer than it.
+        keys = [row["ticket_key"] for row in rows]
+        if not keys:
+            return rows
+        tombstones = dict(
+            db.query(JiraTicketTombstone.ticket_key, JiraTicketTombstone.deleted_at)
+            .filter(JiraTicketTombstone.ticket_key.in_(keys))
+            .all()
+        )
+        if not tombstones:
+            return rows
+        return [
+            row
+            for row in rows
+            if row["ticket_key"] not in tombstones
+            or (row.get("updated_at") and row["updated_at"] > tombstones[row["ticket_key"]])
+        ]
+
+    def upsert_ticket_rows(self, db: Session, rows: list[dict[str, Any]]) -> int:
+        """
+        Upsert a page of ticket rows with one multi-row INSERT ... ON CONFLICT.
+        Rows whose Jira `updated` value did not change are left untouched.
+        Returns the number of rows inserted or updated.
+        """
+        # ON CONFLICT cannot touch the same row twice in one statement.
+        unique_rows = list({row["ticket_key"]: row for row in rows}.values())
+        if not unique_rows:
+            return 0
+
+        stmt = insert(JiraTicket).values(unique_rows)
+        update = _ticket_update_set(stmt)
+        update["last_synced_at"] = func.now()
+        result = db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["ticket_key"],
+                set_=update,
+                where=or_(
+                    JiraTicket.updated_at.is_distinct_from(stmt.excluded.updated_at),
+                    JiraTicket.status_category.is_distinct_from(stmt.excluded.status_category),
+                ),
             )
-            for member in members:
-                account_id = (member.get("accountId") or "").strip()
-                email = (member.get("emailAddress") or "").strip().lower()
-                if not account_id or not email:
-                    continue
-                user_account_ids.add(account_id)
+        )
+        return max(result.rowcount or 0, 0)
 
-                stmt = insert(User).values(
-                    jsm_account_id=account_id,
-                    email=email,
-                    organization_id=org_id,
-                    is_active=True,
-                )
-                update = {
-                    "email": stmt.excluded.email,
-                    "organization_id": stmt.excluded.organization_id,
-                    "is_active": True,
-                    "updated_at": func.now(),
-                }
-                db.execute(
-                    stmt.on_conflict_do_update(
-                        index_elements=["jsm_account_id"],
-                        set_=update,
-                    )
-                )
+    def _get_watermark(self, db: Session, project_key: str) -> Optional[datetime]:
+        row = db.get(JiraSyncWatermark, project_key)
+        return row.last_updated_at if row else None
 
-        # Step 5: Deactivate users no longer in JSM.
-        if user_account_ids:
-            db.query(User).filter(~User.jsm_account_id.in_(user_account_ids)).update(
-                {"is_active": False, "updated_at": func.now()},
-                synchronize_session=False,
+    def _advance_watermark(self, db: Session, project_key: str, updated_at: datetime) -> None:
+        stmt = insert(JiraSyncWatermark).values(
+            project_key=project_key,
+            last_updated_at=updated_at,
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["project_key"],
+                set_={
+                    "last_updated_at": func.greatest(
+                        JiraSyncWatermark.last_updated_at,
+                        stmt.excluded.last_updated_at,
+                    ),
+                    "updated_at": func.now(),
+                },
             )
+        )
+
+    def apply_issue_event(self, db: Session, payload: dict[str, Any]) -> str:
+        """
+        Apply a single jira:issue_* webhook event to jira_tickets.
+        Events older than the last one applied to the ticket are dropped, and
+        deletions leave a tombstone so older updates cannot recreate the row.
+        """
+        event = payload.get("webhookEvent")
+        issue = payload.get("issue") or {}
+        ticket_key = issue.get("key")
+        if not ticket_key:
+            return "ignored"
+
+        fields = issue.get("fields") or {}
+        # Without the payload timestamp, order by the issue's own updated
+        # time; never by the receive time, which runs ahead of real events.
+        event_at = _event_time(payload.get("timestamp")) or _parse_jira_datetime(fields.get("updated"))
+        if event == "jira:issue_deleted":
+            return self._apply_deletion(db, ticket_key, event_at)
+
+        tombstone = db.get(JiraTicketTombstone, ticket_key)
+        if tombstone and (event_at is None or event_at <= tombstone.deleted_at):
+            return "stale"
+
+        project = fields.get("project") or {}
+        values = _ticket_values(issue, project.get("key") or PROJECT_KEY)
+        if not values:
+            return "ignored"
+
+        stmt = insert(JiraTicket).values(**values, last_event_at=event_at)
+        update = _ticket_update_set(stmt)
+        update["last_synced_at"] = func.now()
+        if event_at is None:
+            # Nothing to order by: only fill rows no event has touched yet,
+            # and leave last_event_at for the next timed event.
+            where = JiraTicket.last_event_at.is_(None)
         else:
-            db.query(User).update(
-                {"is_active": False, "updated_at": func.now()},
-                synchronize_session=False,
+            update["last_event_at"] = stmt.excluded.last_event_at
+            where = or_(
+                JiraTicket.last_event_at.is_(None),
+                JiraTicket.last_event_at < stmt.excluded.last_event_at,
             )
-
+        result = db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["ticket_key"],
+                set_=update,
+                where=where,
+            )
+        )
         db.commit()
+        return "upserted" if result.rowcount else "stale"
 
-        summary = {
-            "organizations_seen": len(organizations),
-            "organizations_active": len(org_jsm_ids),
-            "users_active": len(user_account_ids),
-        }
-        self.logger.info("JSM sync completed", extra=summary)
-        return summary
+    def _apply_deletion(self, db: Session, ticket_key: str, event_at: Optional[datetime]) -> str:
+        # A deletion is final, so an untimed one is stamped with the current
+        # time: every genuine update for the issue happened before it.
+        deleted_at = event_at or datetime.now(timezone.utc)
+        stmt = insert(JiraTicketTombstone).values(ticket_key=ticket_key, deleted_at=deleted_at)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["ticket_key"],
+                set_={
+                    "deleted_at": func.greatest(
+                        JiraTicketTombstone.deleted_at,
+                        stmt.excluded.deleted_at,
+                    ),
+                },
+            )
+        )
+        deleted = (
+            db.query(JiraTicket)
+            .filter(JiraTicket.ticket_key == ticket_key)
+            .filter(
+                or_(
+                    JiraTicket.last_event_at.is_(None),
+                    JiraTicket.last_event_at <= deleted_at,
+                )
+            )
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return "deleted" if deleted else "stale"
 
-    async def sync_jira_tickets(self, db: Session, project_key: str = PROJECT_KEY) -> dict[str, Any]:
-        self.logger.info("Jira ticket sync started", extra={"project_key": project_key})
 
-        start_at = 0
-        max_results = 100
-        total_seen = 0
+async def _stream_pages(run: SyncRunRecorder, pages: AsyncIterator[T]) -> AsyncIterator[T]:
+    """
+    Yield pages from a Jira paginator while the next page is already being
+    fetched, so network time overlaps with writing the current page.
+    Time spent waiting on Jira is recorded as the fetch stage.
+    """
+    iterator = pages.__aiter__()
+    pending = asyncio.ensure_future(iterator.__anext__())
+    try:
         while True:
-            page = await self.jira_service.list_all_tickets(
-                project=project_key,
-                start_at=start_at,
-                max_results=max_results,
-            )
-            issues = page.get("issues", [])
-            total = int(page.get("total") or 0)
-            if not issues:
-                break
-
-            for issue in issues:
-                ticket_key = issue.get("key")
-                if not ticket_key:
-                    continue
-                fields = issue.get("fields", {}) or {}
-                assignee = fields.get("assignee") or {}
-                priority = fields.get("priority") or {}
-                status = fields.get("status") or {}
-                reporter = fields.get("reporter") or {}
-                description = fields.get("description")
-                if description is not None and not isinstance(description, str):
-                    description = json.dumps(description, ensure_ascii=True)
-
-                stmt = insert(JiraTicket).values(
-                    ticket_key=ticket_key,
-                    project_key=project_key,
-                    summary=fields.get("summary"),
-                    description=description,
-                    status=status.get("name"),
-                    priority=priority.get("name"),
-                    assignee=assignee.get("displayName"),
-                    reporter_name=reporter.get("displayName"),
-                    reporter_email=reporter.get("emailAddress"),
-                    created_at=fields.get("created"),
-                    updated_at=fields.get("updated"),
-                )
-                update = {
-                    "project_key": stmt.excluded.project_key,
-                    "summary": stmt.excluded.summary,
-                    "description": stmt.excluded.description,
-                    "status": stmt.excluded.status,
-                    "priority": stmt.excluded.priority,
-                    "assignee": stmt.excluded.assignee,
-                    "reporter_name": stmt.excluded.reporter_name,
-                    "reporter_email": stmt.excluded.reporter_email,
-                    "created_at": stmt.excluded.created_at,
-                    "updated_at": stmt.excluded.updated_at,
-                    "last_synced_at": func.now(),
-                }
-                db.execute(
-                    stmt.on_conflict_do_update(
-                        index_elements=["ticket_key"],
-                        set_=update,
-                    )
-                )
+            with run.stage("fetch"):
+                try:
+                    page = await pending
+                except StopAsyncIteration:
+                    return
+                run.add_rows("fetch", len(page))
+            pending = asyncio.ensure_future(iterator.__anext__())
+            yield page
+    finally:
+        if not pending.done():
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+        await iterator.aclose()
+
+
+def _merge_page(
+    db: Session,
+    table: str,
+    columns: tuple[str, ...],
+    rows: list[tuple],
+    merge_sql: str,
+    params: dict[str, Any],
+) -> int:
+    if not rows:
+        return 0
+    _copy_rows(db, table, columns, rows)
+    merged = db.execute(text(merge_sql), params).rowcount
+    db.commit()
+    return max(merged or 0, 0)
+
+
+def _deactivate_missing(db: Session, run_id: uuid.UUID) -> tuple[int, int]:
+    params = {"run_id": str(run_id)}
+    deactivated = db.execute(text(_DEACTIVATE_ORGS), params).rowcount or 0
+    deactivated += db.execute(text(_DEACTIVATE_USERS), params).rowcount or 0
+    users_active = db.execute(
+        text("SELECT count(DISTINCT jsm_account_id) FROM jsm_user_stage WHERE run_id = :run_id"),
+        params,
+    ).scalar()
+    # Users may have moved between organizations; recount all of them.
+    OrganizationService().refresh_counters(db)
+    db.commit()
+    return deactivated, int(users_active or 0)
 
-            total_seen += len(issues)
-            start_at = int(page.get("startAt", start_at)) + int(page.get("maxResults", max_results))
-            if start_at >= total:
-                break
 
+def _clear_stage(db: Session, run_id: uuid.UUID) -> None:
+    try:
+        db.execute(text("DELETE FROM jsm_org_stage WHERE run_id = :run_id"), {"run_id": str(run_id)})
+        db.execute(text("DELETE FROM jsm_user_stage WHERE run_id = :run_id"), {"run_id": str(run_id)})
         db.commit()
-        summary = {"tickets_seen": total_seen, "project_key": project_key}
-        self.logger.info("Jira ticket sync completed", extra=summary)
-        return summary
+    except Exception:
+        db.rollback()
+        logging.getLogger(__name__).exception("JSM staging cleanup failed", extra={"run_id": str(run_id)})
+
+
+def _copy_rows(db: Session, table: str, columns: tuple[str, ...], rows: list[tuple]) -> int:
+    """COPY rows into a staging table on the session's current connection."""
+    if not rows:
+        return 0
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+    return len(rows)
+
+
+def _ticket_values(issue: dict[str, Any], project_key: str) -> Optional[dict[str, Any]]:
+    ticket_key = issue.get("key")
+    if not ticket_key:
+        return None
+    fields = issue.get("fields", {}) or {}
+    assignee = fields.get("assignee") or {}
+    priority = fields.get("priority") or {}
+    status = fields.get("status") or {}
+    status_category = status.get("statusCategory") or {}
+    reporter = fields.get("reporter") or {}
+    description = fields.get("description")
+    if description is not None and not isinstance(description, str):
+        description = json.dumps(description, ensure_ascii=True)
+
+    return {
+        "ticket_key": ticket_key,
+        "project_key": project_key,
+        "summary": fields.get("summary"),
+        "description": description,
+        "status": status.get("name"),
+        "status_category": _status_category(status_category.get("key"), status.get("name")),
+        "priority": priority.get("name"),
+        "assignee": assignee.get("displayName"),
+        "reporter_name": reporter.get("displayName"),
+        "reporter_email": reporter.get("emailAddress"),
+        "created_at": _parse_jira_datetime(fields.get("created")),
+        "updated_at": _parse_jira_datetime(fields.get("updated")),
+    }
+
+
+def _status_category(key: Optional[str], status: Optional[str]) -> str:
+    if key in STATUS_CATEGORIES:
+        return key
+    return STATUS_CATEGORY_BY_NAME.get((status or "").strip().lower(), "indeterminate")
+
+
+def _ticket_update_set(stmt) -> dict[str, Any]:
+    return {
+        "project_key": stmt.excluded.project_key,
+        "summary": stmt.excluded.summary,
+        "description": stmt.excluded.description,
+        "status": stmt.excluded.status,
+        "status_category": stmt.excluded.status_category,
+        "priority": stmt.excluded.priority,
+        "assignee": stmt.excluded.assignee,
+        "reporter_name": stmt.excluded.reporter_name,
+        "reporter_email": stmt.excluded.reporter_email,
+        "created_at": stmt.excluded.created_at,
+        "updated_at": stmt.excluded.updated_at,
+    }
+
+
+def _parse_jira_datetime(value: Any) -> Optional[datetime]:
+    # Jira timestamps look like 2024-01-15T10:30:00.000+0700.
+    if not value or not isinstance(value, str):
+        return None
+    for fmt in ("%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S%z"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _event_time(timestamp: Any) -> Optional[datetime]:
+    # Jira sends the event time as epoch milliseconds.
+    try:
+        return datetime.fromtimestamp(int(timestamp) / 1000, tz=timezone.utc)
+    except (TypeError, ValueError):
+        return None
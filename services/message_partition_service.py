@@ -0,0 +1,201 @@
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+PARTITION_PREFIX = "messages_p"
+_PARTITION_NAME = re.compile(r"^messages_p(\d{4})_(\d{2})$")
+
+# Partitions of messages plus any detached ones an interrupted archive run
+# left behind; relispartition tells them apart.
+_LIST_PARTITIONS = """
+SELECT c.relname, c.relispartition
+FROM pg_class AS c
+JOIN pg_namespace AS n ON n.oid = c.relnamespace
+WHERE n.nspname = current_schema()
+    AND c.relkind = 'r'
+    AND c.relname ~ '^messages_p[0-9]{4}_[0-9]{2}$'
+"""
+
+_ARCHIVE_COLUMNS = ("id", "session_id", "external_message_id", "role", "content", "created_at")
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y_%m}"
+
+
+def partition_ddl(month: date, parent: str = "messages") -> list[str]:
+    """
+    Statements that create one monthly partition. Bounds are UTC month
+    starts. A unique constraint on the parent would have to include
+    created_at, so the (session_id, external_message_id) key is a unique
+    index on each partition; message_dedupe enforces it across months.
+    """
+    name = partition_name(month)
+    start = f"{month:%Y-%m-%d} 00:00:00+00"
+    end = f"{add_months(month, 1):%Y-%m-%d} 00:00:00+00"
+    return [
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {parent} "
+        f"FOR VALUES FROM ('{start}') TO ('{end}')",
+        f"CREATE UNIQUE INDEX IF NOT EXISTS {name}_session_external_key "
+        f"ON {name} (session_id, external_message_id)",
+    ]
+
+
+class MessagePartitionService:
+    """
+    Maintains the monthly partitions of messages.
+
+    ensure_partitions() keeps the current month and the next few months
+    created ahead of time. archive() detaches partitions older than the
+    retention window, exports each one to gzipped NDJSON under the archive
+    directory and drops it. The directory must be an existing absolute path,
+    meant to be a durable mounted volume; container disk is lost on restart.
+    A partition is only dropped after its export has been read back and its
+    row count matches the table, and detached partitions left by an
+    interrupted run are picked up again by the next one.
+    """
+
+    def __init__(self) -> None:
+        self.logger = logging.getLogger(__name__)
+
+    def ensure_partitions(self, db: Session, months_ahead: int) -> list[str]:
+        current = self._current_month()
+        existing = {name for name, _ in self._partitions(db)}
+        created: list[str] = []
+        for offset in range(max(months_ahead, 0) + 1):
+            month = add_months(current, offset)
+            if partition_name(month) in existing:
+                continue
+            for statement in partition_ddl(month):
+                db.execute(text(statement))
+            created.append(partition_name(month))
+        db.commit()
+        if created:
+            self.logger.info("Message partitions created", extra={"partitions": ", ".join(created)})
+        return created
+
+    def archive(
+        self,
+        db: Session,
+        retention_months: int,
+        archive_dir: Optional[str],
+    ) -> list[str]:
+        """
+        Archive every partition that ends before the retention window. A
+        retention of 0 or less keeps all history. Nothing is archived unless
+        archive_dir names an existing absolute directory.
+        """
+        if retention_months <= 0:
+            return []
+        directory = Path(archive_dir) if archive_dir else None
+        if directory is None or not directory.is_absolute() or not directory.is_dir():
+            self.logger.warning(
+                "Message archiving skipped: archive directory is not an existing absolute path",
+                extra={"archive_dir": archive_dir},
+            )
+            return []
+        cutoff = add_months(self._current_month(), -retention_months)
+        archived: list[str] = []
+        for name, attached in sorted(self._partitions(db)):
+            match = _PARTITION_NAME.match(name)
+            month = date(int(match.group(1)), int(match.group(2)), 1)
+            if month >= cutoff:
+                continue
+            if attached:
+                # Keep the parent's ACCESS EXCLUSIVE lock from queueing behind
+                # long readers and stalling message writes; retry next run.
+                db.execute(text("SET LOCAL lock_timeout = '5s'"))
+                db.execute(text(f"ALTER TABLE messages DETACH PARTITION {name}"))
+                db.commit()
+            path, rows = self._export(db, name, directory)
+            db.execute(text(f"DROP TABLE {name}"))
+            db.commit()
+            archived.append(name)
+            self.logger.info(
+                "Message partition archived",
+                extra={"partition": name, "rows": rows, "path": str(path)},
+            )
+        return archived
+
+    def maintain(
+        self,
+        db: Session,
+        months_ahead: int,
+        retention_months: int,
+        archive_dir: Optional[str],
+    ) -> dict[str, Any]:
+        created = self.ensure_partitions(db, months_ahead)
+        archived = self.archive(db, retention_months, archive_dir)
+        return {"created": created, "archived": archived}
+
+    def _current_month(self) -> date:
+        now = datetime.now(timezone.utc)
+        return date(now.year, now.month, 1)
+
+    def _partitions(self, db: Session) -> list[tuple[str, bool]]:
+        return [(row[0], bool(row[1])) for row in db.execute(text(_LIST_PARTITIONS))]
+
+    def _export(self, db: Session, name: str, directory: Path) -> tuple[Path, int]:
+        path = directory / f"{name}.ndjson.gz"
+        partial = directory / f"{name}.ndjson.gz.partial"
+        result = db.connection().execution_options(stream_results=True, yield_per=5000).execute(
+            text(f"SELECT {', '.join(_ARCHIVE_COLUMNS)} FROM {name} ORDER BY created_at, id")
+        )
+        rows = 0
+        with gzip.open(partial, "wt", encoding="utf-8") as handle:
+            for row in result:
+                handle.write(json.dumps(_archive_record(row._mapping), ensure_ascii=False))
+                handle.write("\n")
+                rows += 1
+        # The partition is detached, so nothing writes to it any more.
+        expected = db.execute(text(f"SELECT count(*) FROM {name}")).scalar_one()
+        db.commit()
+        with open(partial, "rb") as handle:
+            os.fsync(handle.fileno())
+        written = _count_records(partial)
+        if rows != expected or written != expected:
+            raise RuntimeError(
+                f"Archive of {name} is incomplete: {written} rows written, {expected} in table"
+            )
+        os.replace(partial, path)
+        directory_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(directory_fd)
+        finally:
+            os.close(directory_fd)
+        return path, rows
+
+
+def _count_records(path: Path) -> int:
+    """Read an export back, parsing every line, and return its record count."""
+    count = 0
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        for line in handle:
+            json.loads(line)
+            count += 1
+    return count
+
+
+def _archive_record(row: Any) -> dict[str, Optional[str]]:
+    record = {}
+    for column in _ARCHIVE_COLUMNS:
+        value = row[column]
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif value is not None and not isinstance(value, str):
+            value = str(value)
+        record[column] = value
+    return record
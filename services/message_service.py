@@ -2,9 +2,64 @@ from typing import Optional
 import html
 import re
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from models.models import Message
+from sqlalchemy import desc, func, text, tuple_
+from core.pubsub import MESSAGE_CHANNEL
+from models.models import Message, MessageDedupe
+
+# unique_violation, raised by the message_dedupe primary key (or a
+# partition's own index) when a redelivery races past is_duplicate().
+_UNIQUE_VIOLATION = "23505"
+
+# Keeps the denormalized last-message preview and unread counter on the
+# session in step with a newly flushed message, then queues a NOTIFY for
+# dashboard listeners (delivered by Postgres on commit). The preview only
+# moves forward, and updated_at is left alone so list ordering is unaffected.
+_TOUCH_SESSION = text(
+    f"""
+    WITH m AS (
+        SELECT
+            msg.id,
+            msg.session_id,
+            msg.content,
+            msg.role,
+            msg.created_at,
+            s.last_message_at IS NULL OR msg.created_at >= s.last_message_at AS newer
+        FROM messages AS msg
+        JOIN channel_sessions AS s ON s.id = msg.session_id
+        WHERE msg.id = :message_id AND msg.created_at = :created_at
+    ),
+    touched AS (
+        UPDATE channel_sessions AS cs
+        SET
+            last_message_text = CASE WHEN m.newer THEN m.content ELSE cs.last_message_text END,
+            last_message_role = CASE WHEN m.newer THEN m.role ELSE cs.last_message_role END,
+            last_message_at = CASE WHEN m.newer THEN m.created_at ELSE cs.last_message_at END,
+            unread_count = cs.unread_count + CASE
+                WHEN m.role = 'user'
+                    AND m.created_at > coalesce(cs.last_read_at, '1970-01-01'::timestamptz)
+                THEN 1 ELSE 0
+            END
+        FROM m
+        WHERE cs.id = m.session_id
+        RETURNING cs.id AS session_id, cs.unread_count, m.id AS message_id, m.role, m.created_at
+    )
+    SELECT pg_notify(
+        '{MESSAGE_CHANNEL}',
+        json_build_object(
+            'type', 'message',
+            'session_id', session_id,
+            'message_id', message_id,
+            'role', role,
+            'created_at', created_at,
+            'unread_count', unread_count
+        )::text
+    )
+    FROM touched
+    """
+)
+
 
 class MessageService:
     def _sanitize_for_storage(self, text: str) -> str:
@@ -21,15 +76,33 @@ class MessageService:
         session_id,
         text: str,
         external_message_id: Optional[str] = None,
-    ) -> Message:
+    ) -> Optional[Message]:
+        """
+        Returns None when the message is a redelivery that raced past
+        is_duplicate() and was rejected by the message_dedupe key.
+        """
         message = Message(
             session_id=session_id,
             role="user",
             content=text,
             external_message_id=external_message_id,
         )
-        db.add(message)
-        db.flush()  # penting, belum commit
+        try:
+            with db.begin_nested():
+                if external_message_id:
+                    db.add(
+                        MessageDedupe(
+                            session_id=session_id,
+                            external_message_id=external_message_id,
+                        )
+                    )
+                db.add(message)
+                db.flush()  # penting, belum commit
+        except IntegrityError as exc:
+            if getattr(exc.orig, "pgcode", None) != _UNIQUE_VIOLATION or not external_message_id:
+                raise
+            return None
+        self._touch_session(db, message)
         return message
 
     def save_system_message(self, db: Session, session_id, text: str) -> Message:
@@ -40,6 +113,7 @@ class MessageService:
         )
         db.add(message)
         db.flush()
+        self._touch_session(db, message)
         return message
 
     def save_employee_message(self, db: Session, session_id, text: str) -> Message:
@@ -50,8 +124,16 @@ class MessageService:
         )
         db.add(message)
         db.flush()
+        self._touch_session(db, message)
         return message
 
+    def _touch_session(self, db: Session, message: Message) -> None:
+        # created_at pins the lookup to a single partition.
+        db.execute(
+            _TOUCH_SESSION,
+            {"message_id": str(message.id), "created_at": message.created_at},
+        )
+
     def is_duplicate(
         self,
         db: Session,
@@ -61,10 +143,10 @@ class MessageService:
         if not external_message_id:
             return False
         return (
-            db.query(Message)
+            db.query(MessageDedupe.session_id)
             .filter(
-                Message.session_id == session_id,
-                Message.external_message_id == external_message_id,
+                MessageDedupe.session_id == session_id,
+                MessageDedupe.external_message_id == external_message_id,
             )
             .first()
             is not None
@@ -76,6 +158,8 @@ class MessageService:
         session_id,
         limit: int = 8,
     ) -> list[Message]:
+        # Ordered by the partition key, so the scan walks partitions newest
+        # first and stops as soon as `limit` rows are found.
         return (
             db.query(Message)
             .filter(Message.session_id == session_id)
@@ -83,3 +167,36 @@ class MessageService:
             .limit(limit)
             .all()
         )
+
+    def get_messages_page(
+        self,
+        db: Session,
+        session_id,
+        limit: int,
+        offset: int = 0,
+        before: Optional[tuple] = None,
+    ) -> list[Message]:
+        """
+        Newest-first page of a session's messages. `before` is the
+        (created_at, id) of the last message already seen; when given, the
+        page is a keyset seek and `offset` is ignored.
+        """
+        query = db.query(Message).filter(Message.session_id == session_id)
+        if before:
+            query = query.filter(tuple_(Message.created_at, Message.id) < tuple_(*before))
+        elif offset:
+            query = query.offset(offset)
+        return (
+            query.order_by(desc(Message.created_at), desc(Message.id))
+            .limit(limit)
+            .all()
+        )
+
+    def get_messages_version(self, db: Session, session_id) -> tuple[int, Optional[object]]:
+        """(count, newest created_at) for a session; a cheap HTTP cache validator."""
+        count, newest = (
+            db.query(func.count(Message.id), func.max(Message.created_at))
+            .filter(Message.session_id == session_id)
+            .one()
+        )
+        return int(count or 0), newest
@@ -0,0 +1,260 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core.jira_constants import OPEN_STATUS_CATEGORIES
+from models.models import ChannelSession, JiraTicket, MetricHourly, MetricsRollupWatermark, Organization
+
+def _hour(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _utc_hour(column: str) -> str:
+    # Truncate in UTC whatever the session time zone is, so buckets line up
+    # with the UTC hours `since` and the API are built from.
+    return f"date_trunc('hour', {column} AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'"
+
+
+# Each rollup computes complete hourly buckets from its source table into
+# `fresh`. In the same statement, rows of the window that no longer exist
+# under the same dimensions (a session that verified into an organization, a
+# ticket linked after its hour was rolled up) are deleted and the rest are
+# upserted, so re-running a window is idempotent and late writes are picked
+# up by the next run that still covers their hour.
+_REPLACE_TAIL = """,
+stale AS (
+    DELETE FROM metrics_hourly AS h
+    WHERE h.metric = '{metric}'
+        AND {window}
+        AND NOT EXISTS (
+            SELECT 1 FROM fresh AS f
+            WHERE f.bucket = h.bucket
+                AND f.platform = h.platform
+                AND f.role = h.role
+                AND f.organization_id = h.organization_id
+        )
+)
+INSERT INTO metrics_hourly (metric, bucket, platform, role, organization_id, value)
+SELECT '{metric}', bucket, platform, role, organization_id, value
+FROM fresh
+ON CONFLICT (metric, bucket, platform, role, organization_id) DO UPDATE SET
+    value = EXCLUDED.value,
+    updated_at = now()
+WHERE metrics_hourly.value IS DISTINCT FROM EXCLUDED.value
+"""
+
+_ROLLUP_MESSAGES = f"""
+WITH fresh AS (
+    SELECT
+        {_utc_hour("m.created_at")} AS bucket,
+        cs.platform AS platform,
+        m.role AS role,
+        coalesce(u.organization_id::text, '') AS organization_id,
+        count(*) AS value
+    FROM messages AS m
+    JOIN channel_sessions AS cs ON cs.id = m.session_id
+    LEFT JOIN users AS u ON u.id = cs.user_id
+    WHERE m.created_at >= :since AND m.created_at < :until
+    GROUP BY 1, 2, 3, 4
+)""" + _REPLACE_TAIL.format(metric="messages", window="h.bucket >= :since AND h.bucket < :until")
+
+_ROLLUP_SESSIONS = f"""
+WITH fresh AS (
+    SELECT
+        {_utc_hour("cs.created_at")} AS bucket,
+        cs.platform AS platform,
+        '' AS role,
+        coalesce(u.organization_id::text, '') AS organization_id,
+        count(*) AS value
+    FROM channel_sessions AS cs
+    LEFT JOIN users AS u ON u.id = cs.user_id
+    WHERE cs.created_at >= :since AND cs.created_at < :until
+    GROUP BY 1, 2, 4
+)""" + _REPLACE_TAIL.format(metric="sessions_created", window="h.bucket >= :since AND h.bucket < :until")
+
+# Tickets are bucketed by their Jira creation time, which can be far older
+# than the sync that wrote them, so every hour touched by a recent sync is
+# recomputed in full.
+_ROLLUP_TICKETS = f"""
+WITH touched AS (
+    SELECT DISTINCT {_utc_hour("created_at")} AS bucket
+    FROM jira_tickets
+    WHERE last_synced_at >= :since AND created_at IS NOT NULL
+),
+fresh AS (
+    SELECT
+        touched.bucket AS bucket,
+        coalesce(l.platform, 'portal') AS platform,
+        '' AS role,
+        coalesce(l.organization_id::text, '') AS organization_id,
+        count(*) AS value
+    FROM jira_tickets AS t
+    JOIN touched ON touched.bucket = {_utc_hour("t.created_at")}
+    LEFT JOIN ticket_links AS l ON l.ticket_key = t.ticket_key
+    GROUP BY 1, 2, 4
+)""" + _REPLACE_TAIL.format(
+    metric="tickets_created",
+    window="h.bucket IN (SELECT bucket FROM touched)",
+)
+
+# Bucketed by their own creation time, so they are recomputed per time range.
+_RANGE_ROLLUPS = {
+    "messages": _ROLLUP_MESSAGES,
+    "sessions_created": _ROLLUP_SESSIONS,
+}
+ROLLUPS = {**_RANGE_ROLLUPS, "tickets_created": _ROLLUP_TICKETS}
+# One day of buckets per transaction when catching up on a long gap.
+_CATCH_UP_CHUNK = timedelta(days=1)
+_WATERMARK = "hourly"
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Timeseries metric names that are slices of a stored metric.
+_DERIVED = {
+    "messages_in": ("messages", ("user",)),
+    "messages_out": ("messages", ("agent", "employee")),
+}
+METRICS = (*ROLLUPS, "verifications_completed", *_DERIVED)
+GROUP_BY = ("platform", "role", "organization_id")
+
+
+class MetricsService:
+    """Hourly dashboard metrics kept in metrics_hourly."""
+
+    def __init__(self) -> None:
+        self.logger = logging.getLogger(__name__)
+
+    def refresh(self, db: Session, lookback: timedelta = timedelta(hours=3)) -> dict[str, int]:
+        """
+        Recompute the rolled-up metrics from the stored watermark, or from
+        `lookback` ago if that is earlier, so hours missed while the job was
+        not running are caught up. With no watermark, all history is rolled
+        up. Ranges are processed a day at a time, each in its own transaction,
+        and the watermark advances after each one.
+        """
+        now = datetime.now(timezone.utc)
+        current_hour = _hour(now)
+        since = _hour(now - lookback)
+        watermark = db.get(MetricsRollupWatermark, _WATERMARK)
+        if watermark is not None:
+            since = min(since, watermark.rolled_up_until)
+            tickets_since = since
+        else:
+            # Messages are never older than their session, so this is the
+            # earliest bucket with data.
+            earliest = db.query(func.min(ChannelSession.created_at)).scalar()
+            if earliest is not None:
+                since = min(since, _hour(earliest))
+            tickets_since = _EPOCH
+
+        written = dict.fromkeys(ROLLUPS, 0)
+        end_of_range = current_hour + timedelta(hours=1)
+        start = since
+        while start < end_of_range:
+            until = min(start + _CATCH_UP_CHUNK, end_of_range)
+            for metric, sql in _RANGE_ROLLUPS.items():
+                result = db.execute(text(sql), {"since": start, "until": until})
+                written[metric] += max(result.rowcount or 0, 0)
+            # The current hour is still filling, so it is never marked done.
+            self._advance_watermark(db, min(until, current_hour))
+            db.commit()
+            start = until
+        result = db.execute(text(_ROLLUP_TICKETS), {"since": tickets_since})
+        written["tickets_created"] = max(result.rowcount or 0, 0)
+        db.commit()
+        self.logger.info(
+            "Metrics rollup refreshed",
+            extra={"since": since.isoformat(), **written},
+        )
+        return written
+
+    def _advance_watermark(self, db: Session, rolled_up_until: datetime) -> None:
+        stmt = insert(MetricsRollupWatermark).values(name=_WATERMARK, rolled_up_until=rolled_up_until)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["name"],
+                set_={"rolled_up_until": stmt.excluded.rolled_up_until, "updated_at": func.now()},
+            )
+        )
+
+    def record_verification(self, db: Session, platform: str, organization_id: Optional[Any]) -> None:
+        """Count a completed email verification in the caller's transaction."""
+        bucket = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        stmt = insert(MetricHourly).values(
+            metric="verifications_completed",
+            bucket=bucket,
+            platform=platform or "",
+            role="",
+            organization_id=str(organization_id) if organization_id else "",
+            value=1,
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["metric", "bucket", "platform", "role", "organization_id"],
+                set_={"value": MetricHourly.value + 1, "updated_at": func.now()},
+            )
+        )
+
+    def totals(self, db: Session) -> dict[str, int]:
+        total_conversations = (
+            db.query(func.coalesce(func.sum(MetricHourly.value), 0))
+            .filter(MetricHourly.metric == "sessions_created")
+            .scalar()
+        )
+        open_tickets = (
+            db.query(func.count(JiraTicket.id))
+            .filter(JiraTicket.status_category.in_(OPEN_STATUS_CATEGORIES))
+            .scalar()
+        )
+        active_organizations = (
+            db.query(func.count(Organization.id))
+            .filter(Organization.is_active.is_(True))
+            .scalar()
+        )
+        return {
+            "total_conversations": int(total_conversations or 0),
+            "open_tickets": int(open_tickets or 0),
+            "active_organizations": int(active_organizations or 0),
+        }
+
+    def timeseries(
+        self,
+        db: Session,
+        metric: str,
+        start: datetime,
+        end: datetime,
+        interval: str = "hour",
+        platform: Optional[str] = None,
+        organization_id: Optional[str] = None,
+        group_by: Optional[str] = None,
+    ) -> list[dict[str, Any]]:
+        stored, roles = _DERIVED.get(metric, (metric, None))
+        bucket = func.timezone(
+            "UTC", func.date_trunc(interval, func.timezone("UTC", MetricHourly.bucket))
+        ).label("bucket")
+        columns = [bucket]
+        if group_by:
+            columns.append(getattr(MetricHourly, group_by).label("group"))
+        query = (
+            db.query(*columns, func.sum(MetricHourly.value).label("value"))
+            .filter(MetricHourly.metric == stored)
+            .filter(MetricHourly.bucket >= start, MetricHourly.bucket < end)
+        )
+        if roles:
+            query = query.filter(MetricHourly.role.in_(roles))
+        if platform:
+            query = query.filter(MetricHourly.platform == platform)
+        if organization_id:
+            query = query.filter(MetricHourly.organization_id == organization_id)
+        query = query.group_by(*columns).order_by(*columns)
+
+        points = []
+        for row in query.all():
+            point = {"bucket": row.bucket, "value": int(row.value or 0)}
+            if group_by:
+                point[group_by] = row.group or None
+            points.append(point)
+        return points
@@ -0,0 +1,52 @@
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Recounts users, linked conversations and ticket links for the selected
+# organizations in one statement. Rows whose counters are already correct
+# are left untouched.
+_REFRESH_COUNTERS = """
+UPDATE organizations AS o
+SET user_count = c.user_count,
+    conversation_count = c.conversation_count,
+    ticket_count = c.ticket_count
+FROM (
+    SELECT
+        org.id,
+        (SELECT count(*) FROM users AS u WHERE u.organization_id = org.id) AS user_count,
+        (
+            SELECT count(*)
+            FROM channel_sessions AS cs
+            JOIN users AS u ON u.id = cs.user_id
+            WHERE u.organization_id = org.id
+        ) AS conversation_count,
+        (SELECT count(*) FROM ticket_links AS t WHERE t.organization_id = org.id) AS ticket_count
+    FROM organizations AS org
+    WHERE {scope}
+) AS c
+WHERE o.id = c.id
+    AND (o.user_count, o.conversation_count, o.ticket_count)
+        IS DISTINCT FROM (c.user_count, c.conversation_count, c.ticket_count)
+"""
+
+
+class OrganizationService:
+    def refresh_counters(self, db: Session, organization_ids: Optional[Iterable[Any]] = None) -> int:
+        """
+        Recompute the denormalized counters on organizations. Pass the ids
+        touched by a write to refresh just those, or None to refresh all.
+        Pending ORM changes must be flushed first; nothing is committed here.
+        """
+        if organization_ids is None:
+            result = db.execute(text(_REFRESH_COUNTERS.format(scope="true")))
+            return max(result.rowcount or 0, 0)
+
+        ids = sorted({str(org_id) for org_id in organization_ids if org_id})
+        if not ids:
+            return 0
+        result = db.execute(
+            text(_REFRESH_COUNTERS.format(scope="org.id = ANY(CAST(:ids AS uuid[]))")),
+            {"ids": ids},
+        )
+        return max(result.rowcount or 0, 0)
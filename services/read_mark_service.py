@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import text
+
+from core.config import settings
+from core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# One statement per flush: apply the newest read time per session and
+# recount unread user messages after it. Read marks never move backwards.
+_FLUSH_SQL = """
+UPDATE channel_sessions AS cs
+SET last_read_at = v.read_at,
+    unread_count = (
+        SELECT count(*)
+        FROM messages AS m
+        WHERE m.session_id = cs.id
+            AND m.role = 'user'
+            AND m.created_at > v.read_at
+    )
+FROM (VALUES {values}) AS v(session_id, read_at)
+WHERE cs.id = v.session_id
+    AND (cs.last_read_at IS NULL OR cs.last_read_at < v.read_at)
+"""
+
+
+class ReadMarkWriter:
+    """
+    Coalesces dashboard read marks in memory and writes them in batches.
+
+    mark() only records the latest read time per session; a background task
+    flushes everything pending every `interval` seconds with a single
+    UPDATE ... FROM (VALUES ...). Read requests never open a write
+    transaction, and repeated marks for a hot session cost one row update
+    per flush. mark() is safe to call from sync endpoints running in the
+    threadpool.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._pending: dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup = asyncio.Event()
+
+    def mark(self, session_id, read_at: datetime) -> None:
+        key = str(session_id)
+        with self._lock:
+            current = self._pending.get(key)
+            if current is None or read_at > current:
+                self._pending[key] = read_at
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._task = asyncio.create_task(self._run(), name="read-mark-writer")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+        try:
+            return await asyncio.to_thread(self._write, batch)
+        except Exception:
+            logger.exception("Read mark flush failed", extra={"sessions": len(batch)})
+            with self._lock:
+                for session_id, read_at in batch.items():
+                    current = self._pending.get(session_id)
+                    if current is None or read_at > current:
+                        self._pending[session_id] = read_at
+            return 0
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    def _write(self, batch: dict[str, datetime]) -> int:
+        params: dict[str, object] = {}
+        values = []
+        for index, (session_id, read_at) in enumerate(batch.items()):
+            params[f"s{index}"] = session_id
+            params[f"r{index}"] = read_at
+            values.append(f"(CAST(:s{index} AS uuid), CAST(:r{index} AS timestamptz))")
+        db = SessionLocal()
+        try:
+            result = db.execute(text(_FLUSH_SQL.format(values=", ".join(values))), params)
+            db.commit()
+            return max(result.rowcount or 0, 0)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+read_mark_writer = ReadMarkWriter(settings.read_mark_flush_interval_ms / 1000)
@@ -0,0 +1,126 @@
+from typing import Any, Iterable
+
+from sqlalchemy import case, func, literal_column, or_
+from sqlalchemy.orm import Session
+
+from models.models import ChannelSession, JiraTicket, Message, Organization, User
+
+SEARCH_TYPES = ("conversations", "messages", "tickets")
+
+
+def ts_query(q: str):
+    """
+    Match a user query against vectors built from both the English and
+    "simple" configurations: English stems, simple keeps Indonesian words.
+    """
+    return func.websearch_to_tsquery(literal_column("'english'::regconfig"), q).op("||")(
+        func.websearch_to_tsquery(literal_column("'simple'::regconfig"), q)
+    )
+
+
+class SearchService:
+    """Ranked dashboard search backed by tsvector GIN and pg_trgm indexes."""
+
+    def search(
+        self,
+        db: Session,
+        q: str,
+        types: Iterable[str] = SEARCH_TYPES,
+        limit: int = 20,
+    ) -> dict[str, list[dict[str, Any]]]:
+        results: dict[str, list[dict[str, Any]]] = {}
+        if "conversations" in types:
+            results["conversations"] = self.search_conversations(db, q, limit)
+        if "messages" in types:
+            results["messages"] = self.search_messages(db, q, limit)
+        if "tickets" in types:
+            results["tickets"] = self.search_tickets(db, q, limit)
+        return results
+
+    def search_conversations(self, db: Session, q: str, limit: int) -> list[dict[str, Any]]:
+        like = f"%{q}%"
+        rank = func.greatest(
+            func.coalesce(func.similarity(User.email, q), 0),
+            func.similarity(ChannelSession.external_user_id, q),
+            func.coalesce(func.similarity(ChannelSession.last_message_text, q), 0),
+        ).label("rank")
+        rows = (
+            db.query(ChannelSession, User, Organization, rank)
+            .outerjoin(User, ChannelSession.user_id == User.id)
+            .outerjoin(Organization, User.organization_id == Organization.id)
+            .filter(
+                or_(
+                    User.email.ilike(like),
+                    ChannelSession.external_user_id.ilike(like),
+                    ChannelSession.last_message_text.ilike(like),
+                )
+            )
+            .order_by(rank.desc(), ChannelSession.id.desc())
+            .limit(limit)
+            .all()
+        )
+        return [
+            {
+                "session_id": str(session.id),
+                "channel": session.platform,
+                "external_user_id": session.external_user_id,
+                "user_email": user.email if user else None,
+                "organization": {"id": str(org.id), "name": org.name} if org else None,
+                "last_message": session.last_message_text,
+                "last_message_at": session.last_message_at,
+                "rank": round(float(score or 0), 4),
+            }
+            for session, user, org, score in rows
+        ]
+
+    def search_messages(self, db: Session, q: str, limit: int) -> list[dict[str, Any]]:
+        query = ts_query(q)
+        rank = func.ts_rank_cd(Message.search_vector, query).label("rank")
+        rows = (
+            db.query(Message, ChannelSession.platform, rank)
+            .join(ChannelSession, ChannelSession.id == Message.session_id)
+            .filter(Message.search_vector.op("@@")(query))
+            .order_by(rank.desc(), Message.created_at.desc(), Message.id.desc())
+            .limit(limit)
+            .all()
+        )
+        return [
+            {
+                "message_id": str(message.id),
+                "session_id": str(message.session_id),
+                "channel": platform,
+                "role": message.role,
+                "text": message.content,
+                "created_at": message.created_at,
+                "rank": round(float(score or 0), 4),
+            }
+            for message, platform, score in rows
+        ]
+
+    def search_tickets(self, db: Session, q: str, limit: int) -> list[dict[str, Any]]:
+        query = ts_query(q)
+        key_match = JiraTicket.ticket_key.ilike(f"%{q}%")
+        # An identifier hit on the ticket key outranks any text match.
+        rank = (
+            func.ts_rank_cd(JiraTicket.search_vector, query)
+            + case((key_match, 1.0), else_=0.0)
+        ).label("rank")
+        rows = (
+            db.query(JiraTicket, rank)
+            .filter(or_(JiraTicket.search_vector.op("@@")(query), key_match))
+            .order_by(rank.desc(), JiraTicket.id.desc())
+            .limit(limit)
+            .all()
+        )
+        return [
+            {
+                "ticket_key": ticket.ticket_key,
+                "summary": ticket.summary,
+                "status": ticket.status,
+                "priority": ticket.priority,
+                "created_at": ticket.created_at,
+                "updated_at": ticket.updated_at,
+                "rank": round(float(score or 0), 4),
+            }
+            for ticket, score in rows
+        ]
@@ -0,0 +1,103 @@
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional
+
+from core.database import SessionLocal
+from models.models import SyncRun
+
+STAGES = ("fetch", "upsert", "deactivate")
+
+
+class SyncRunRecorder:
+    """
+    Records one sync run in the sync_runs ledger.
+
+    Ledger rows are written through their own short-lived sessions, so a run
+    that fails halfway is still recorded even though the sync transaction
+    itself is rolled back. Ledger errors are logged and never fail the sync.
+    """
+
+    def __init__(self, kind: str) -> None:
+        self.kind = kind
+        self.run_id = uuid.uuid4()
+        self.logger = logging.getLogger(__name__)
+        self._stages: dict[str, dict[str, Any]] = {
+            name: {"duration_ms": 0.0, "rows": 0} for name in STAGES
+        }
+        self._reached: Optional[str] = None
+
+    def start(self) -> "SyncRunRecorder":
+        self._write(
+            lambda db: db.add(
+                SyncRun(id=self.run_id, kind=self.kind, status="running", stages=self._stages)
+            )
+        )
+        return self
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block of work; repeated blocks of the same stage accumulate."""
+        if name not in self._stages:
+            self._stages[name] = {"duration_ms": 0.0, "rows": 0}
+        if self._reached != name and self._index(name) > self._index(self._reached):
+            self._reached = name
+            self._update(stage=name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._stages[name]["duration_ms"] += (time.perf_counter() - start) * 1000
+
+    def add_rows(self, name: str, count: int) -> None:
+        self._stages.setdefault(name, {"duration_ms": 0.0, "rows": 0})["rows"] += int(count or 0)
+
+    def finish(self, summary: dict[str, Any]) -> None:
+        self._update(
+            status="succeeded",
+            finished_at=datetime.now(timezone.utc),
+            stages=self._rounded_stages(),
+            summary=summary,
+        )
+
+    def fail(self, exc: BaseException) -> None:
+        self._update(
+            status="failed",
+            finished_at=datetime.now(timezone.utc),
+            stages=self._rounded_stages(),
+            error=f"{type(exc).__name__}: {exc}"[:2000],
+        )
+
+    def _index(self, name: Optional[str]) -> int:
+        if name is None:
+            return -1
+        return STAGES.index(name) if name in STAGES else len(STAGES)
+
+    def _rounded_stages(self) -> dict[str, dict[str, Any]]:
+        return {
+            name: {"duration_ms": round(values["duration_ms"], 1), "rows": values["rows"]}
+            for name, values in self._stages.items()
+        }
+
+    def _update(self, **values: Any) -> None:
+        self._write(
+            lambda db: db.query(SyncRun)
+            .filter(SyncRun.id == self.run_id)
+            .update(values, synchronize_session=False)
+        )
+
+    def _write(self, action) -> None:
+        db = SessionLocal()
+        try:
+            action(db)
+            db.commit()
+        except Exception:
+            db.rollback()
+            self.logger.exception(
+                "Sync run ledger write failed",
+                extra={"kind": self.kind, "run_id": str(self.run_id)},
+            )
+        finally:
+            db.close()
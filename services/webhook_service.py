@@ -11,10 +11,13 @@ from agents import Agent, Runner, function_tool
 from adapters.registry import send_reply
 from schemas.message import IncomingMessage
 from core.config import settings
+from core.prometheus import AGENT_RUN_DURATION, AGENT_RUNS_IN_FLIGHT, observe
+from core.tracing import span
 from services.auth_service import AuthService
 from services.email_service import EmailService
 from services.jira_service import JiraService
 from services.message_service import MessageService
+from services.organization_service import OrganizationService
 from services.session_service import SessionService
 from models.models import User, TicketLink
 
@@ -75,6 +78,12 @@ class WebhookService:
             message.text,
             external_message_id=message.message_id,
         )
+        if saved_user_message is None:
+            self.logger.info(
+                "Duplicate message ignored",
+                extra={"session_id": str(session.id), "message_id": message.message_id},
+            )
+            return
 
         if self._is_reset_message(message.text):
             reply_text = self._reset_draft(db, session)
@@ -166,10 +175,13 @@ class WebhookService:
         if expires_at.tzinfo is None:
             expires_at = expires_at.replace(tzinfo=timezone.utc)
         if expires_at <= datetime.now(timezone.utc):
+            organization_id = session.user.organization_id if session.user else None
             session.auth_status = "anonymous"
             session.user_id = None
             session.auth_expires_at = None
             db.add(session)
+            db.flush()
+            OrganizationService().refresh_counters(db, [organization_id])
 
     def _sync_auth_state(self, db, session) -> None:
         user = session.user
@@ -618,7 +630,10 @@ class WebhookService:
 
         prompt = self._build_agent_input(context, history, message.text)
         try:
-            result = await Runner.run(agent, input=prompt)
+            with observe(AGENT_RUN_DURATION, in_flight=AGENT_RUNS_IN_FLIGHT), span(
+                "agent.run", "client", model=settings.llm_model
+            ):
+                result = await Runner.run(agent, input=prompt)
             output = (result.final_output or "").strip()
             output = self._sanitize_plain_text(output, session.platform)
             if not output:
@@ -635,10 +650,10 @@ class WebhookService:
             if key in allowed and value:
                 draft[key] = value
         self.logger.info(
-            "Draft updated session_id=%s draft=%s",
-            str(session.id),
-            json.dumps(draft, ensure_ascii=False),
+            "Draft updated",
+            extra={"session_id": str(session.id), "fields": ", ".join(sorted(patch))},
         )
+        self.logger.debug("Draft contents", extra={"session_id": str(session.id), "draft": dict(draft)})
 
         missing = self._missing_draft_fields(draft)
         draft["status"] = "preview" if not missing else "collecting"
@@ -689,11 +704,10 @@ class WebhookService:
         missing = self._missing_draft_fields(draft)
         if missing:
             self.logger.info(
-                "Cannot create ticket, missing fields session_id=%s missing=%s draft=%s",
-                str(session.id),
-                ", ".join(missing),
-                json.dumps(draft, ensure_ascii=False),
+                "Cannot create ticket, missing fields",
+                extra={"session_id": str(session.id), "missing": ", ".join(missing)},
             )
+            self.logger.debug("Draft contents", extra={"session_id": str(session.id), "draft": dict(draft)})
             return self._prompt_next_missing_field(draft)
 
         user = db.get(User, session.user_id) if session.user_id else None
@@ -735,6 +749,8 @@ class WebhookService:
                 platform=session.platform,
             )
             db.add(link)
+            db.flush()
+            OrganizationService().refresh_counters(db, [user.organization_id])
         if session.platform == "telegram":
             return f"✅ <b>Ticket created</b>: {html.escape(issue_key or '-')}"
         return f"Ticket created: {issue_key}"
@@ -974,9 +990,8 @@ class WebhookService:
     def _start_ticket_flow(self, db, session, patch: dict) -> str:
         if patch:
             self.logger.info(
-                "Start ticket flow with patch session_id=%s patch=%s",
-                str(session.id),
-                json.dumps(patch, ensure_ascii=False),
+                "Start ticket flow with patch",
+                extra={"session_id": str(session.id), "fields": ", ".join(sorted(patch))},
             )
             return self._update_draft(db, session, patch)
 
@@ -987,9 +1002,8 @@ class WebhookService:
         db.add(session)
         db.commit()
         self.logger.info(
-            "Start ticket flow initialized session_id=%s draft=%s",
-            str(session.id),
-            json.dumps(draft, ensure_ascii=False),
+            "Start ticket flow initialized",
+            extra={"session_id": str(session.id)},
         )
         return self._prompt_next_missing_field(draft)
 